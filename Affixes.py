@@ -21,9 +21,21 @@ except (IndexError) :
 confs = configparser.ConfigParser(delimiters='\t',comment_prefixes='#',inline_comment_prefixes='#')
 confs.read(Path(configurationes))
 #
+argomenti = sys.argv[2:]
+fragmenta = argomenti[argomenti.index('merge') + 1:] if 'merge' in argomenti else [] #files of partial results merged instead of reading the treebank (see Partials and Quid.py merge)
+argomenti = argomenti[:argomenti.index('merge')] if 'merge' in argomenti else argomenti
+opera = set(argomenti) or {'underived','aclitica'} #tasks to carry out, all by default (see also Quid.py)
+if opera - {'underived','aclitica'} :
+	print('Unknown tasks: {} (underived, aclitica).'.format(', '.join(sorted(opera - {'underived','aclitica'}))))
+	quit()
+#
 tools = Path(confs.get('Tools','reader')).resolve()
 sys.path.append(os.path.abspath(tools))
-from CoNLLUToolsmini import UDPos, readCoNLLU, syntacticwords, readUDfeatures, writeUDfeatures
+from CoNLLUToolsmini import UDPos, readCoNLLU, shardCoNLLU, incrementCoNLLU, hashCoNLLU, selectCoNLLU, selectionfiles, syntacticwords, readUDfeatures, writeUDfeatures
+from Resources import loadresources
+from Metrics import Mensura
+from Columnar import formatum, columnar
+from Partials import writepartial, loadpartials
 normo = Path(confs.get('Tools','normaliser')).resolve()
 sys.path.append(os.path.abspath(normo))
 try : 
@@ -31,92 +43,193 @@ try :
 	normalizator = orthonormalizatio
 except ImportError :
 	normalizator = lambda x : x.lower()
+try : 
+	from Normaliser import orthonormalizationes #batch version, if available
+	normalizatores = orthonormalizationes
+except ImportError :
+	normalizatores = lambda xx : list(map(normalizator,xx))
 #
 conllu = Path(confs.get('Data','conllu')).resolve()
-print('Extracting data from: {}\n'.format(conllu))
+print('Merging partial results from: {}\n'.format(', '.join(fragmenta)) if fragmenta else 'Extracting data from: {}\n'.format(conllu))
 morphologia = Path(confs.get('Data','derivation')).resolve()
 #
-classificator = confs.get('Parameters','classifier')
+classificatores = [c.strip() for c in confs.get('Parameters','classifier').split(',') if c.strip()] #more than one classifier or threshold (separated by commas) for a sweep, see below
 inversio = confs.getboolean('Parameters','inversion')
 lemmata = confs.getboolean('Parameters','lemmas')
 ydioma = confs.get('Parameters','lang')
-limes = confs.getint('Parameters','threshold')
+limites = [int(t) for t in confs.get('Parameters','threshold').split(',')]
+compacta = confs.getboolean('Parameters','compact',fallback=False) #lighter trees instead of Networkx graphs
+memoria = confs.getboolean('Parameters','cache',fallback=False) #binary cache of the parsed treebank (only for a serial reading)
+processus = confs.getint('Parameters','processes',fallback=1) #number of processes reading the treebank in parallel
+incrementa = confs.getboolean('Parameters','incremental',fallback=False) #only new or modified sentences are processed with respect to the previous run
+metrica = confs.getboolean('Parameters','metrics',fallback=False) #timings, counts and peak memory of every stage, written to a JSON file
+profilo = confs.get('Parameters','profile',fallback='none') #cprofile or tracemalloc, for a deeper (and slower) profiling stored with the metrics
+colonnare = formatum(confs.get('Parameters','columnar',fallback='none')) #typed columnar copies of the tables, checked at once (see Columnar)
+approssimazione = confs.getfloat('Parameters','approximate',fallback=0) #memory budget (in MiB) of an approximate collection, for very large treebanks; 0 for exact counts (see Sketches)
+if approssimazione and incrementa :
+	print('The approximate collection cannot be incremental, as the state of an incremental run keeps the contribution of every sentence.')
+	quit()
+selezione = selectCoNLLU(confs.get('Parameters','select',fallback='all')) #only sentences whose metadata satisfy some conditions are read, the others being skipped before their rows are parsed (see selectCoNLLU)
+parziale = confs.getboolean('Parameters','partial',fallback=False) #the collections are also written to a file of partial results, to be merged with those of other parts of the treebank (see Partials)
+vestigium = repr((sorted(confs.items('Parameters')),[hashCoNLLU(f) for f in (Path(__file__),tools / 'CoNLLUToolsmini.py',tools / 'Resources.py',normo / 'Normaliser.py',morphologia / 'derived',morphologia / 'compound',morphologia / 'ADV.tsv') if f.exists()] + [hashCoNLLU(f) for f in selectionfiles(confs.get('Parameters','select',fallback='all'))])) #anything which could change the results of an incremental run
+impronta = repr((classificatores,inversio,lemmata,ydioma,approssimazione,[hashCoNLLU(f) for f in (normo / 'Normaliser.py',morphologia / 'derived',morphologia / 'compound',morphologia / 'ADV.tsv') if f.exists()])) #anything which could change the collections of a partial run, which can then be merged with others having the same
+#
+
+
+mensura = Mensura('Affixes','_'.join(('metrics','affixes',ydioma)) + '.json',profilo,scribere=metrica) #see Metrics
 #
 
 
 #Definition of structures and import of word lists
-lexemata = dict() 
-simplicia = set()
-aderivata = set()
-frequentiae = Counter()
-#
-derivata = set()
-with open(morphologia / 'derived','r',encoding='utf8') as intro : 
-	for riga in intro :
-		derivata.add(normalizator(riga.strip()))
-#
-composita = set()
-with open(morphologia / 'compound','r',encoding='utf8') as intro : 
-	for riga in intro :
-		composita.add(normalizator(riga.strip()))
-#
-advpos = {}
-with open(morphologia / 'ADV.tsv','r',encoding='utf8') as intro : 
-	for riga in intro :
-		l,p = riga.strip(' \n').split('\t')
-		advpos[normalizator(l)] = 'PRON' if p == 'REL' else p #See paper for this decision. The ADV treatment is specific for Latin, but can possibly readapted to other languages
+with mensura.stage('resources') :
+	risorse = loadresources(morphologia,normalizator,normalizatores,lang=ydioma) #compiled only once, see Resources
+derivata = risorse.derivata
+composita = risorse.composita
+advpos = risorse.advpos
 #
 corrpos = {'PROPN': lambda x : 'NOUN', 'ADV' : lambda x : advpos.get(x,'ADV') , 'NUM' : lambda x : 'DET'} #Remapping of part-of-speech tags; see paper. This is valid universally (except for ad hoc treatment of ADV)
 negfeat = {'Degree' : lambda x : bool(x!='Pos'), 'InflClass' : lambda x : bool(x not in ('Ind','IndEurInd')), 'VerbForm' : lambda x : bool(x!='Fin')} #NB: this list is partly ad hoc, even if it has wider applicability; it might need some additions for other languages
 alexpos= {p for p,v in UDPos.items() if 'alex' in v}
+miscexclusa = ('CitationHierarchy','LiLaflcat','LASLAVariant','SpaceAfter') #NB: this list has been hardcoded with regard to known MISC features in UD Latin treebanks, and might need to be augmented by other features
+#
+if approssimazione : #frequencies from a Count-Min sketch, and only the most frequent forms kept with their features, within the memory budget (see Sketches)
+	from Sketches import CountMinSketch, FrequentItems, dividere
+	larghezza, capienza = dividere(approssimazione)
+	contatore = lambda : CountMinSketch(larghezza)
+	inventario = lambda : FrequentItems(capienza)
+else :
+	contatore, inventario = Counter, dict
 #
 
 
-#Reading and extraction
-for s,a in readCoNLLU(conllu,syntax=False) :		
-	print(s['sent_id'],end='\r')
-	for nodus in syntacticwords(a) :
+#Extraction from a sequence of sentences (the whole treebank, a span of it, or a single sentence). Features are collected by form, as (lemma, part of speech, form), and only grouped into lexemes once everything is read (see below). Simple and underived lexemes are first collected in dictionaries, so as to keep the order of their first appearance: partial collections can thus be merged (see below) into exactly what a single reading would produce. The numbers of sentences and tokens read are returned as well
+#No classifier is involved in the collection, so that one reading serves any classifier: with inversion, a classifier missing from a token is recorded as a feature of its own, named (classifier,), and only merged into the real one when aggregating (see notae)
+def colligere(sententiae,progressus=True) :
+	
+	formae = inventario()
+	simplicia = dict()
+	aderivata = dict()
+	frequentiae = contatore()
+	numeri = [0,0]
+	
+	for s,a in sententiae :		
+		tokens = numeri[1]
+		for nodus in syntacticwords(a) :
+			
+			numeri[1] += 1
 				
-		orthoforma = normalizator(nodus.form)
-		ortholemma = normalizator(nodus.lemma) if lemmata else orthoforma
-		cupos = corrpos.get(nodus.upos, lambda x : nodus.upos)(ortholemma) 
+			orthoforma = normalizator(nodus.form)
+			ortholemma = normalizator(nodus.lemma) if lemmata else orthoforma
+			cupos = corrpos.get(nodus.upos, lambda x : nodus.upos)(ortholemma) 
 		
-		#Criteria to identify only lexical and analysable forms, so excluding digits, symbols, punctuation marks, abbreviations...
-		if cupos not in alexpos \
-		and not regex.fullmatch(r'\d+(-\d+)?',orthoforma) \
-		and nodus.feats.get('NumForm',None) not in ('Digit','Roman') \
-		and not nodus.feats.get('Abbr',None) :
+			#Criteria to identify only lexical and analysable forms, so excluding digits, symbols, punctuation marks, abbreviations...
+			if cupos not in alexpos \
+			and not regex.fullmatch(r'\d+(-\d+)?',orthoforma) \
+			and nodus.feats.get('NumForm',None) not in ('Digit','Roman') \
+			and not nodus.feats.get('Abbr',None) :
 			
-			#Checking derivation status
-			if ortholemma not in composita : 
-				simplicia.add((ortholemma,cupos))
-				#NB: The following criteria are partly specific to Latin for the identification of non-derived elements, and could possibly be modified for other languages, if applicable at all
-				if ortholemma not in derivata \
-				and not nodus.feats.get('Degree',None) \
-				and (nodus.feats.get('NumType',None) not in ('Ord','Dist','Mult') or ortholemma in ('semel','bis','ter','quater')) : 
-					aderivata.add((ortholemma,cupos))
-			#
+				#Checking derivation status
+				if ortholemma not in composita : 
+					simplicia[(ortholemma,cupos)] = None
+					#NB: The following criteria are partly specific to Latin for the identification of non-derived elements, and could possibly be modified for other languages, if applicable at all
+					if ortholemma not in derivata \
+					and not nodus.feats.get('Degree',None) \
+					and (nodus.feats.get('NumType',None) not in ('Ord','Dist','Mult') or ortholemma in ('semel','bis','ter','quater')) : 
+						aderivata[(ortholemma,cupos)] = None
+				#
 					
-			#Managing productively derived adverbial forms
-			if cupos != nodus.upos and 'main' in UDPos[cupos] and nodus.upos == 'ADV' : 
-				nodus.feats['Form'] = nodus.feats.get('Form',()) + ('Adverbial',)	
+				#Managing productively derived adverbial forms #NB: features are shared among tokens, so they are not modified in place
+				adverbialis = {}
+				if cupos != nodus.upos and 'main' in UDPos[cupos] and nodus.upos == 'ADV' : 
+					adverbialis['Form'] = nodus.feats.get('Form',()) + ('Adverbial',)	
 				
-			#Finally collecting forms into lexemes	
-			lexemata.setdefault((ortholemma,cupos),dict())
-			lexemata[(ortholemma,cupos)].setdefault(orthoforma,defaultdict(set))
-				
-			frequentiae[(ortholemma,cupos,orthoforma)] += 1
+				#Finally collecting forms
+				chiave = (ortholemma,cupos,orthoforma)
+				notae = formae.setdefault(chiave,defaultdict(set)) #with the approximate collection, features of a form which is not kept are not stored
+				frequentiae[chiave] += 1
 			
-			proprietates = nodus.feats | nodus.misc
-			if inversio and classificator not in proprietates : 
-				proprietates[classificator] = 'Yes'
-			#
+				proprietates = nodus.feats | adverbialis | nodus.misc
+				if inversio : 
+					proprietates.update({(c,) : 'Yes' for c in classificatores if c not in proprietates})
+				#
 			
-			for f,v in proprietates.items() :
-				if f not in ('CitationHierarchy','LiLaflcat','LASLAVariant','SpaceAfter') : #NB: this list has been hardcoded with regard to known MISC features in UD Latin treebanks, and might need to be augmented by other features
-					fv = tuple(filter(negfeat.get(f,None),v))
-					if fv : 
-						lexemata[(ortholemma,cupos)][orthoforma][f].update(fv)	
+				for f,v in proprietates.items() :
+					nome = f[0] if isinstance(f,tuple) else f #classifiers marked by inversion
+					if nome not in miscexclusa : 
+						fv = tuple(filter(negfeat.get(nome,None),v))
+						if fv : 
+							notae[f].update(fv)	
+		#
+		numeri[0] += 1
+		if progressus :
+			mensura.progress(s['sent_id'],numeri[1] - tokens)
+	
+	return formae, frequentiae, simplicia, aderivata, tuple(numeri)
+#
+
+
+#Merging of the features of a form into those already collected for it
+def unire(notae,pnotae) :
+	for k,v in pnotae.items() :
+		notae[k].update(v)
+#
+
+#Merging of partial collections, in the order of the treebank (simple and underived lexemes stay in order of insertion, see below)
+def miscere(partes) :
+	
+	formae = inventario()
+	simplicia = dict()
+	aderivata = dict()
+	frequentiae = contatore()
+	numeri = [0,0]
+	
+	for pformae, pfrequentiae, psimplicia, paderivata, pnumeri in partes : 
+		if approssimazione :
+			formae.merge(pformae,unire)
+		else :
+			for k,pnotae in pformae.items() :
+				unire(formae.setdefault(k,defaultdict(set)),pnotae)
+		#
+		frequentiae.update(pfrequentiae)
+		simplicia.update(psimplicia)
+		aderivata.update(paderivata)
+		numeri[0] += pnumeri[0]
+		numeri[1] += pnumeri[1]
+	#
+	
+	return formae, frequentiae, simplicia, aderivata, tuple(numeri)
+#
+
+campi = ('form','lemma','upos','feats','misc') #the only columns read (see readCoNLLU), syntax being never needed here
+
+#Reading and extraction, either of the whole treebank or of a span of it (see shardCoNLLU)
+def legere(span=None) :
+	return colligere(readCoNLLU(conllu,syntax=False,compact=compacta,span=span,cache=memoria,intern=True,fields=campi,lazy=True,select=selezione),progressus=span is None) #progress would be garbled by parallel workers
+#
+
+#The treebank is read either incrementally with respect to the previous run (only new or modified sentences are processed, each contributing a partial collection), or in spans read in parallel by more than one process, or all at once, or else merged from the partial results of several readings (see Partials) #NB: workers are forked, so as to inherit the structures defined above; this is not available on every platform
+with mensura.stage('merging' if fragmenta else 'reading') as stadium :
+	if fragmenta :
+		formae, frequentiae, simplicia, aderivata, numeri = miscere(loadpartials(fragmenta,'Affixes',impronta,opera))
+	elif incrementa :
+		contributiones, novae = incrementCoNLLU(conllu,'_'.join(('incrementum','affixes',ydioma)) + '.pickle',mensura.wrap('extraction',lambda s,a : colligere([(s,a)],progressus=False)),fingerprint=vestigium,syntax=False,compact=compacta,intern=True,fields=campi,lazy=True,select=selezione)
+		print('{} new or modified sentences out of {}.\n'.format(novae,len(contributiones)))
+		formae, frequentiae, simplicia, aderivata, numeri = miscere([c for c in contributiones if c is not None])
+	elif processus > 1 :
+		import multiprocessing
+		with multiprocessing.get_context('fork').Pool(processus) as piscina :
+			formae, frequentiae, simplicia, aderivata, numeri = miscere(piscina.imap(legere,shardCoNLLU(conllu,4*processus)))
+	else :
+		formae, frequentiae, simplicia, aderivata, numeri = miscere([legere()])
+	stadium.count(*numeri)
+	mensura.sententiae, mensura.tokens = numeri
+if parziale :
+	with mensura.stage('partial') :
+		writepartial('_'.join(('partial','affixes',ydioma)) + '.gz','Affixes',impronta,{'underived','aclitica'},(formae,frequentiae,simplicia,aderivata,numeri),treebank=conllu)
+simplicia, aderivata = set(iter(simplicia)), set(iter(aderivata)) #added one by one as in a single reading, so that even the order of iteration of the sets is the same
+lexemata = dict() #forms of every lexeme, with their features, in order of first appearance
+for (ortholemma,cupos,orthoforma),notae in formae.items() :
+	lexemata.setdefault((ortholemma,cupos),dict())[orthoforma] = notae
 #
 
 
@@ -125,6 +238,8 @@ for s,a in readCoNLLU(conllu,syntax=False) :
 ## Handy statistics
 print('\nSome statistics:')
 print('The treebank contains {} (normalised) word lexemes, of which {} have been identified as non-compounds (simple), and {} as underived from any base.'.format(len(lexemata),len(simplicia),len(aderivata)))
+if approssimazione :
+	print('These figures come from an approximate collection within {} MiB: {} forms are kept with their features (out of at most {}), among which all those occurring more than {} times, and a kept form can lack the features of at most as many of its tokens; frequencies of forms exceed the real ones by at most {:.1f} (with probability {:.0%}).'.format(approssimazione,len(formae),capienza,formae.error,frequentiae.error,frequentiae.probability))
 
 print('\nTheir distributions according to parts of speech is as follows:')
 posdistrlex = [Counter([k[1] for k in lexemata]), Counter([k[1] for k in simplicia]), Counter([k[1] for k in aderivata])]
@@ -136,86 +251,136 @@ for p in UDPos :
 #
 
 ##Full list and random selection of 100 lexemes identified as non-derived according to the supplied morphological information
+if 'underived' in opera :
 
-with open('underived_lexemes' + f'_{ydioma}'+'.tsv','w',encoding='utf8') as exo :
-	for ad in aderivata :
-		exo.write('{}\t{}\n'.format(ad[0],ad[1]))
-#
-import random
-rn = 100
-with open('underived_lexemes_random' + str(rn) + f'_{ydioma}'+'.tsv','w',encoding='utf8') as exo :
-	for rf in random.sample(tuple(aderivata),rn) :
-		exo.write('{}\t{}\n'.format(rf[0],rf[1]))
-#
+	with mensura.stage('underived TSV'), open('underived_lexemes' + f'_{ydioma}'+'.tsv','w',encoding='utf8') as exo, columnar('underived_lexemes' + f'_{ydioma}',(('lemma','dict'),('pos','dict')),colonnare) as colonne :
+		for ad in aderivata :
+			exo.write('{}\t{}\n'.format(ad[0],ad[1]))
+			colonne.append(ad[0],ad[1])
+	#
+	import random
+	rn = 100
+	with mensura.stage('underived TSV'), open('underived_lexemes_random' + str(rn) + f'_{ydioma}'+'.tsv','w',encoding='utf8') as exo :
+		for rf in random.sample(tuple(aderivata),rn) :
+			exo.write('{}\t{}\n'.format(rf[0],rf[1]))
+	#
 
 
 # Identification of uninflectable lexemes/forms
+#With more than one classifier or threshold (a sweep), all variants are computed from the same collection: the first classifier and threshold give the usual tables, the others tables named after them (e.g. aclitica_la_NounClass_5.tsv, aclitica_pos_la_NounClass.tsv), and a summary of all variants is written to aclitica_sweep_la.tsv
+if 'aclitica' in opera :
 
-aclitica = defaultdict(dict)
-#
-contapos = defaultdict(set)
-apos = defaultdict(set)
-contafeat = defaultdict(Counter)
-afeat = defaultdict(Counter)
+	#Features of a form for a classifier: with inversion, the classifier counts as present, with value 'Yes', if it is missing from any token of the form, and the marks of the other classifiers are left out. The order of the features is the one a single reading with that classifier would give
+	def notae(l,ff,classificator) :
+		if not inversio :
+			return lexemata[l][ff]
+		ft = defaultdict(set)
+		for f,v in lexemata[l][ff].items() :
+			if not isinstance(f,tuple) :
+				ft[f].update(v)
+			elif f[0] == classificator :
+				ft[classificator].update(v)
+		return ft
+	#
 
-for l,f in lexemata.items() :
-	
-	for ff,ft in f.items() :								 
-		proprietates = writeUDfeatures(ft)
-		contafeat[l[1]].update(proprietates.split('|'))
-		contapos[l[1]].add((l[0],ff))
-		#
-		if classificator not in ft :
-			afeat[l[1]].update(proprietates.split('|'))
-			aclitica[(l[0],l[1])][ff] = proprietates
-			apos[l[1]].add((l[0],ff))
-		
-		
-aclifeats = sorted(set().union(*[set(d.keys()) for d in afeat.values() ]))	
-		
-tabula = '_'.join(('aclitica',ydioma)) + '.tsv'	
-with open(tabula,'w',encoding='utf8') as exo : 
-	for l,fp in aclitica.items() :
-		aformae = set()
-		afs = defaultdict(set)
-		for f,p in fp.items() : 
-			if frequentiae[(l[0],l[1],f)] > limes :
-				aformae.add(f)
-				for k,v in readUDfeatures(p).items() :
-					afs[k].update(v)				
+	#Uninflected forms of every lexeme, and distributions of lexemes, forms and features by part of speech, for a classifier
+	def aggregare(classificator) :
+
+		aclitica = defaultdict(dict)
 		#
-		infl = set(lexemata[l]) - aformae
-		morfinfl = defaultdict(set)
-		for fl in infl : 
-			for k,v in lexemata[l][fl].items() :
-				morfinfl[k].update(v)			
-		solinfl = set(morfinfl) - set(afs)		
-		#		
-		if aformae : 
-			exo.write('{}\t{}\t{}\t{}\t{}\t{}\t{}\n'.format(l[0],\
-												l[1],\
-												','.join(sorted(aformae)),\
-												sum([frequentiae[(l[0],l[1],af)] for af in aformae]),\
-												writeUDfeatures(afs),\
-												','.join(infl),\
-												','.join(solinfl),\
-													   ))
-
-tabulapos = '_'.join(('aclitica_pos',ydioma)) + '.tsv'
-with open(tabulapos,'w',encoding='utf8') as exo : 
-	for pos,c in contapos.items() :
-		exo.write('{}\t{}\t{}\t{}\n'.format(pos,\
-											str(len(apos[pos])/len(contapos[pos])),\
-											str(sum([frequentiae[(lx[0],pos,lx[1])] for lx in apos[pos]])/sum([frequentiae[(lx[0],pos,lx[1])] for lx in contapos[pos]])),\
-										'\t'.join([':'.join(map(str,fc)) for fc in sorted([(af,afeat[pos][af]/contafeat[pos][af]) for af in aclifeats if af in afeat[pos]],key = itemgetter(1),reverse=True)])\
-									   ))
-		
-		
+		contapos = defaultdict(set)
+		apos = defaultdict(set)
+		contafeat = defaultdict(Counter)
+		afeat = defaultdict(Counter)
 
+		for l,f in lexemata.items() :
+		
+			for ff in f :
+				ft = notae(l,ff,classificator)
+				proprietas = writeUDfeatures(ft)
+				contafeat[l[1]].update(proprietas.split('|'))
+				contapos[l[1]].add((l[0],ff))
+				#
+				if classificator not in ft :
+					afeat[l[1]].update(proprietas.split('|'))
+					aclitica[(l[0],l[1])][ff] = proprietas
+					apos[l[1]].add((l[0],ff))
+			
+			
+		aclifeats = sorted(set().union(*[set(d.keys()) for d in afeat.values() ]))	
 
+		return aclitica, contapos, apos, contafeat, afeat, aclifeats
+	#
 
+	#Table of uninflected forms above a threshold of frequency; it returns the numbers of lexemes, forms and tokens written, and of lexemes by part of speech
+	def scribere(nome,classificator,limes,aclitica) :
+		numeri = [0,0,0,Counter()]
+		with mensura.stage('aclitica TSV'), open(nome + '.tsv','w',encoding='utf8') as exo, columnar(nome,(('lemma','dict'),('pos','dict'),('forms','list'),('frequency','int'),('feats','feats'),('inflected','list'),('inflected_only','list')),colonnare) as colonne : 
+			for l,fp in aclitica.items() :
+				aformae = set()
+				afs = defaultdict(set)
+				for f,p in fp.items() : 
+					if frequentiae[(l[0],l[1],f)] > limes :
+						aformae.add(f)
+						for k,v in readUDfeatures(p).items() :
+							afs[k].update(v)				
+				#
+				infl = set(lexemata[l]) - aformae
+				morfinfl = defaultdict(set)
+				for fl in infl : 
+					for k,v in notae(l,fl,classificator).items() :
+						morfinfl[k].update(v)			
+				solinfl = set(morfinfl) - set(afs)		
+				#		
+				if aformae : 
+					exo.write('{}\t{}\t{}\t{}\t{}\t{}\t{}\n'.format(l[0],\
+														l[1],\
+														','.join(sorted(aformae)),\
+														sum([frequentiae[(l[0],l[1],af)] for af in aformae]),\
+														writeUDfeatures(afs),\
+														','.join(infl),\
+														','.join(solinfl),\
+															   ))
+					colonne.append(l[0],l[1],sorted(aformae),sum([frequentiae[(l[0],l[1],af)] for af in aformae]),afs,infl,solinfl)
+					numeri[0] += 1
+					numeri[1] += len(aformae)
+					numeri[2] += sum([frequentiae[(l[0],l[1],af)] for af in aformae])
+					numeri[3][l[1]] += 1
+		return numeri
+	#
 
+	variantes = []
+	for i,classificator in enumerate(classificatores) :
 
+		with mensura.stage('aggregation') :
+			aclitica, contapos, apos, contafeat, afeat, aclifeats = aggregare(classificator)
+		
+		for j,limes in enumerate(limites) :
+			tabula = '_'.join(('aclitica',ydioma) + ((classificator,str(limes)) if i or j else ()))
+			variantes.append((classificator,limes,tabula + '.tsv',*scribere(tabula,classificator,limes,aclitica)))
 
+		tabulapos = '_'.join(('aclitica_pos',ydioma) + ((classificator,) if i else ()))
+		with mensura.stage('aclitica TSV'), open(tabulapos + '.tsv','w',encoding='utf8') as exo, columnar(tabulapos,(('pos','dict'),('lexemes','float'),('tokens','float'),('feats','floatmap')),colonnare) as colonne : 
+			for pos,c in contapos.items() :
+				rationes = (len(apos[pos])/len(contapos[pos]),sum([frequentiae[(lx[0],pos,lx[1])] for lx in apos[pos]])/sum([frequentiae[(lx[0],pos,lx[1])] for lx in contapos[pos]]),sorted([(af,afeat[pos][af]/contafeat[pos][af]) for af in aclifeats if af in afeat[pos]],key = itemgetter(1),reverse=True))
+				exo.write('{}\t{}\t{}\t{}\n'.format(pos,\
+													str(rationes[0]),\
+													str(rationes[1]),\
+												'\t'.join([':'.join(map(str,fc)) for fc in rationes[2]])\
+											   ))
+				colonne.append(pos,*rationes)
+	#
 
+	##Summary of the sweep: for every classifier and threshold, the table written and its numbers of lexemes, forms and tokens, and of lexemes by part of speech
+	if len(variantes) > 1 :
+		print('\nUninflected forms by classifier and threshold:')
+		print('\nClassifier\tThreshold\tLexemes\tForms\tTokens\tTable')
+		tabulasweep = '_'.join(('aclitica_sweep',ydioma))
+		with open(tabulasweep + '.tsv','w',encoding='utf8') as exo, columnar(tabulasweep,(('classifier','dict'),('threshold','int'),('table','string'),('lexemes','int'),('forms','int'),('tokens','int'),('pos','intmap')),colonnare) as colonne :
+			for classificator,limes,tabula,nlexemata,nformae,ntokens,npos in variantes :
+				print('{}\t{}\t{}\t{}\t{}\t{}'.format(classificator,limes,nlexemata,nformae,ntokens,tabula))
+				exo.write('{}\t{}\t{}\t{}\t{}\t{}\t{}\n'.format(classificator,limes,tabula,nlexemata,nformae,ntokens,'\t'.join(['{}:{}'.format(p,npos[p]) for p in UDPos if npos[p]])))
+				colonne.append(classificator,limes,tabula,nlexemata,nformae,ntokens,{p : npos[p] for p in UDPos if npos[p]})
+#
 
+mensura.dump()
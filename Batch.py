@@ -0,0 +1,152 @@
+#The following code has been developed by Flavio Massimiliano Cecchini as part of the work presented in "Quid verbumst? Applying a definition of word to Latin in Universal Dependencies", SyntaxFest 2025, Ljubljana. Please give credit to the author if you use any part of it.
+#Contact: flaviomassimiliano.cecchini at kuleuven.be
+
+#Batch of extractions (FreeForms.py and/or Affixes.py) over several treebanks, possibly in different languages, launched at once. Tools, normalisers and morphological resources are loaded only once per configuration, before the jobs are scheduled in parallel: each job runs in a fork of this process, so that it finds them already warm
+#The jobs are listed in a tab-separated file, one per row: treebank, configuration file, scripts to launch (comma-separated, by default all), directory for the outputs (by default Output/ followed by the name of the treebank). Empty rows and comments (#) are ignored. Paths are relative to the current directory, as for the single scripts
+#Every job writes its outputs, the effective configuration (with the treebank in place of the one in the configuration file) and the log of each script in its own directory
+#NB: tools are imported by name, so jobs are scheduled grouped by the tools (reader and normaliser) of their configuration, and the modules of a group are dropped before those of the next one are loaded. Forks are not available on every platform
+
+#Useful imports
+import sys, os, configparser, runpy, time
+import multiprocessing
+from multiprocessing.connection import wait
+from pathlib import Path
+#
+
+#Inputs, specifications and data
+try :
+	lavori = sys.argv[1]
+except (IndexError) :
+	print('Please specify the path to a file listing the jobs of this batch (treebank, configuration, scripts, output directory).')
+	quit()
+#
+processus = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() #number of jobs running at the same time
+#
+scripta = {'FreeForms' : Path(__file__).resolve().parent / 'FreeForms.py', 'Affixes' : Path(__file__).resolve().parent / 'Affixes.py'}
+#
+
+
+#Tools of a configuration, which have to be the same for all the jobs forked after a single loading
+def strumenti(confs) :
+	return (confs.get('Tools','reader'),confs.get('Tools','normaliser'))
+#
+
+#Reading of the jobs, with their effective configurations
+compiti = []
+configurationes = {}
+with open(lavori,'r',encoding='utf8') as intro :
+	for riga in intro :
+		riga = riga.split('#')[0].strip(' \n')
+		if not riga :
+			continue
+		treebank, configuratio, *extra = riga.split('\t')
+		scripts = [s.strip() for s in extra[0].split(',')] if extra and extra[0].strip() else list(scripta)
+		exitus = Path(extra[1].strip() if len(extra) > 1 and extra[1].strip() else Path('Output') / Path(treebank).name.split('.')[0]).resolve()
+		#
+		confs = configparser.ConfigParser(delimiters='\t',comment_prefixes='#',inline_comment_prefixes='#')
+		confs.read(Path(configuratio))
+		for sectio, clavis in (('Tools','reader'),('Tools','normaliser'),('Data','derivation')) : #every path becomes absolute, as jobs run in their own directory
+			confs.set(sectio,clavis,str(Path(confs.get(sectio,clavis)).resolve()))
+		confs.set('Data','conllu',str(Path(treebank).resolve()))
+		#
+		exitus.mkdir(parents=True,exist_ok=True)
+		with open(exitus / 'conf','w',encoding='utf8') as exo :
+			confs.write(exo,space_around_delimiters=False)
+		configurationes[Path(configuratio).resolve()] = confs
+		compiti.extend([(s,scripta[s],exitus / 'conf',exitus,strumenti(confs)) for s in scripts])
+compiti.sort(key=lambda c : c[4]) #stable: jobs sharing the same tools keep their order
+#
+
+
+#Warm loading of everything the scripts need: libraries once and for all, tools and resources once per group of jobs (see caricare)
+for l in ('networkx','regex','matplotlib') :
+	try :
+		__import__(l)
+	except ImportError :
+		pass
+try :
+	import matplotlib
+	matplotlib.use('Agg') #no window is ever opened by a batch
+	from matplotlib import pyplot
+except ImportError :
+	pass
+#
+caricati = None #tools currently loaded
+
+#Loads the tools of a group of jobs, and the resources of all their configurations, dropping the modules of the tools loaded before, if different
+def caricare(chiave) :
+	
+	global caricati
+	
+	if chiave == caricati :
+		return
+	if caricati is not None :
+		cartelle = [Path(c) for c in caricati]
+		for nome, modulo in list(sys.modules.items()) :
+			origine = getattr(modulo,'__file__',None)
+			if origine and Path(origine).resolve().parent in cartelle :
+				del sys.modules[nome]
+		sys.path[:] = [p for p in sys.path if p not in caricati]
+	for percorso in reversed(chiave) :
+		sys.path.insert(0,percorso)
+	caricati = chiave
+	#
+	from Resources import loadresources
+	import CoNLLUToolsmini
+	try :
+		from Normaliser import orthonormalizatio #the name can change according to your script
+		normalizator = orthonormalizatio
+	except ImportError :
+		normalizator = lambda x : x.lower()
+	try :
+		from Normaliser import orthonormalizationes #batch version, if available
+		normalizatores = orthonormalizationes
+	except ImportError :
+		normalizatores = lambda xx : list(map(normalizator,xx))
+	#
+	for configuratio, confs in configurationes.items() :
+		if strumenti(confs) == chiave :
+			ydioma = confs.get('Parameters','lang')
+			print('Loading resources for {} ({})'.format(ydioma,configuratio))
+			loadresources(Path(confs.get('Data','derivation')),normalizator,normalizatores,lang=ydioma)
+#
+
+
+#A single job, run in a fork of this process, within its own directory
+def lavorare(script,configuratio,exitus) :
+	os.chdir(exitus)
+	with open(script.stem + '.log','w',encoding='utf8') as registro :
+		sys.stdout = registro
+		sys.argv = [str(script),str(configuratio)]
+		try :
+			runpy.run_path(str(script),run_name='__main__')
+		except SystemExit as e : #the scripts only stop before the end (with quit, i.e. code 0) when they cannot run
+			print('\nStopped before the end.')
+			sys.exit(e.code or 1)
+#
+
+#Scheduling of the jobs, no more than the given number at a time
+contesto = multiprocessing.get_context('fork')
+attesa = list(reversed(compiti))
+correnti = {}
+esiti = []
+inizio = time.time()
+
+while attesa or correnti :
+	while attesa and len(correnti) < processus :
+		nome, script, configuratio, exitus, chiave = attesa.pop()
+		caricare(chiave) #forks of this process inherit the tools loaded at that moment
+		p = contesto.Process(target=lavorare,args=(script,configuratio,exitus))
+		p.start()
+		correnti[p.sentinel] = (p,nome,exitus,time.time())
+		print('Started {} on {}'.format(nome,exitus))
+	for sentinella in wait(list(correnti)) :
+		p, nome, exitus, partenza = correnti.pop(sentinella)
+		p.join()
+		esiti.append((nome,exitus,p.exitcode,time.time() - partenza))
+		print('{} {} on {} ({:.1f} s)'.format('Finished' if p.exitcode == 0 else 'FAILED',nome,exitus,time.time() - partenza))
+#
+
+print('\n{} jobs in {:.1f} s, {} failed.'.format(len(esiti),time.time() - inizio,len([e for e in esiti if e[2] != 0])))
+if any(e[2] != 0 for e in esiti) :
+	sys.exit(1)
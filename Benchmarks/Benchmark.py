@@ -0,0 +1,267 @@
+#The following code has been developed by Flavio Massimiliano Cecchini as part of the work presented in "Quid verbumst? Applying a definition of word to Latin in Universal Dependencies", SyntaxFest 2025, Ljubljana. Please give credit to the author if you use any part of it.
+#Contact: flaviomassimiliano.cecchini at kuleuven.be
+
+#Benchmarks of the reader, of the extraction of nuclei and of the whole scripts on a synthetic treebank (see Synthesis.py), with throughput (tokens per second) and peak memory
+#The outputs of every end-to-end run are compared with the golden ones stored in Golden/, so that an optimisation changing the results is caught at once (random samples and plots are not compared)
+#The approximate collection of Affixes.py (see Sketches) is validated against the exact one for some memory budgets: uninflected forms found by both, and error of frequencies with respect to its bound
+#Usage: python Benchmark.py [--sentences N] [--seed S] [--repeat R] [--only micro|e2e|approximate] [--budgets B,B...] [--json report.json] [--update]
+#NB: end-to-end runs use the language code xx, so that no external resource is needed, and PYTHONHASHSEED=0, as the order of some outputs depends on hashing
+
+#Useful imports
+import sys, os, time, subprocess, argparse, json, tracemalloc, tempfile, filecmp
+from pathlib import Path
+#
+
+radice = Path(__file__).resolve().parent.parent
+sys.path.append(str(radice / 'Tools'))
+sys.path.append(str(Path(__file__).resolve().parent))
+from Synthesis import synthesise
+#
+varianti = {'graph' : {}, 'compact' : {'compact' : 'True'}, 'cache' : {'cache' : 'True'}, 'compact+cache' : {'compact' : 'True', 'cache' : 'True'}, 'processes' : {'processes' : '2'}} #end-to-end configurations, all with the same expected outputs
+scripta = ('FreeForms','Affixes')
+aleatoria = ('underived_lexemes_random',) #outputs depending on random samples
+#
+
+
+#Timing of a function, best of some repetitions, and its peak of allocated memory in a further run
+def misurare(functio,repetitiones=3) :
+	tempi = []
+	for _ in range(repetitiones) :
+		inizio = time.perf_counter()
+		functio()
+		tempi.append(time.perf_counter() - inizio)
+	tracemalloc.start()
+	functio()
+	picco = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+	return min(tempi), picco
+#
+
+#Every field of every node and every edge of a tree, with the types of its values (e.g. (1,0) is not (1.0,0))
+def fotografia(albero) :
+	from CoNLLUToolsmini import CoNLLUTree
+	nodi = albero.features.items() if isinstance(albero,CoNLLUTree) else albero.nodes(data='features')
+	return sorted((repr(n),[repr(v) for v in r]) for n,r in nodi if r is not None), sorted(map(repr,albero.edges()))
+#
+
+#Readings through the cache, first writing it and then reading it, have to give exactly the trees read from the text
+def coerenza(conllu) :
+	from CoNLLUToolsmini import readCoNLLU
+	for compatto in (False,True) :
+		testo = [(s,fotografia(a)) for s,a in readCoNLLU(conllu,syntax=False,compact=compatto)]
+		for lettura in ('cold','warm') :
+			if [(s,fotografia(a)) for s,a in readCoNLLU(conllu,syntax=False,compact=compatto,cache=True)] != testo :
+				raise RuntimeError('A {} reading through the cache differs from the text ({}).'.format(lettura,'compact' if compatto else 'graphs'))
+#
+
+#Micro-benchmarks of the single components
+def micro(conllu,repetitiones=3) :
+	from CoNLLUToolsmini import readCoNLLU, syntacticwords, extractnucleus, extractnuclei, extractallnuclei, featsfusion, hassyntax
+	from Normaliser import orthonormalizatio
+
+	coerenza(conllu)
+	alberi = [a for _,a in readCoNLLU(conllu,syntax=False,intern=True)]
+	tokens = sum(1 for a in alberi for _ in syntacticwords(a))
+	for _ in readCoNLLU(conllu,syntax=False,cache=True) : #warm cache, written with the same options as the measured reading
+		pass
+	#
+	sincipita = ('fixed','flat')
+	relationes = {'nsubj','obj','obl','nmod','amod','advmod','det','case','mark','cc','conj','aux','cop','fixed','flat','punct','iobj','nummod','appos','acl','advcl'}
+	criteria = [dict(funcrel=relationes,funcpos={'ADP','AUX','CCONJ','SCONJ','DET','PRON','PART'},multi=sincipita),dict(funcrel=relationes - {'conj'},funcpos={'NOUN','VERB','ADJ','ADV','PROPN'},multi=sincipita)]
+	sintattici = [(a,[n.id for n in syntacticwords(a)]) for a in alberi if hassyntax(a)]
+	nodi = sum(len(p) for _,p in sintattici)
+	#
+	bundles = [n.feats for a in alberi for n in syntacticwords(a)]
+	forme = [n.form for a in alberi for n in syntacticwords(a)]
+	#
+	def singuli() :
+		for a,parole in sintattici :
+			for n in parole :
+				for c in criteria :
+					extractnucleus(a,n,**c)
+	def multipli() :
+		for a,parole in sintattici :
+			for n in parole :
+				extractnuclei(a,n,criteria)
+	def tutti() :
+		for a,_ in sintattici :
+			for c in criteria :
+				extractallnuclei(a,**c)
+	def normalizzare() :
+		orthonormalizatio.cache_clear()
+		for f in forme :
+			orthonormalizatio(f)
+	#
+	prove = {'readCoNLLU (graphs)' : (lambda : [None for _ in readCoNLLU(conllu,syntax=False)],tokens),\
+			 'readCoNLLU (compact)' : (lambda : [None for _ in readCoNLLU(conllu,syntax=False,compact=True)],tokens),\
+			 'readCoNLLU (interned)' : (lambda : [None for _ in readCoNLLU(conllu,syntax=False,intern=True)],tokens),\
+			 'readCoNLLU (4 fields, lazy)' : (lambda : [None for _ in readCoNLLU(conllu,syntax=False,compact=True,fields=('form','lemma','upos','feats'),lazy=True)],tokens),\
+			 'readCoNLLU (warm cache)' : (lambda : [None for _ in readCoNLLU(conllu,syntax=False,cache=True)],tokens),\
+			 'extractnucleus (2 criteria)' : (singuli,nodi),\
+			 'extractnuclei (2 criteria)' : (multipli,nodi),\
+			 'extractallnuclei (2 criteria)' : (tutti,nodi),\
+			 'featsfusion' : (lambda : featsfusion(bundles),len(bundles)),\
+			 'orthonormalizatio (cold)' : (normalizzare,len(forme)),\
+			}
+	esiti = {}
+	for nome, (functio, quantitas) in prove.items() :
+		tempo, picco = misurare(functio,repetitiones)
+		esiti[nome] = {'seconds' : tempo, 'items' : quantitas, 'items/s' : quantitas / tempo if tempo else None, 'peak_bytes' : picco}
+		print('{:<30}{:>10.3f} s{:>14,.0f} items/s{:>10.1f} MiB peak'.format(nome,tempo,esiti[nome]['items/s'] or 0,picco / 2**20))
+
+	return esiti
+#
+
+#Configuration of an end-to-end run, in its own directory
+def configurare(cartella,conllu,parametri) :
+	cartella.mkdir(parents=True,exist_ok=True)
+	righe = ['[Tools]','reader\t{}'.format(radice / 'Tools'),'normaliser\t{}'.format(radice / 'Tools'),'','[Data]','conllu\t{}'.format(conllu),'derivation\t{}'.format(radice / 'Morphology'),'','[Parameters]','lang\txx','classifier\tInflClass','inversion\tFalse','lemmas\tTrue','threshold\t0']
+	righe.extend('{}\t{}'.format(k,v) for k,v in parametri.items())
+	with open(cartella / 'conf','w',encoding='utf8') as exo :
+		exo.write('\n'.join(righe) + '\n')
+	return cartella / 'conf'
+#
+
+#A script in a child process, with its wall time and its peak resident memory (in bytes)
+def lanciare(script,configuratio,cartella) :
+	ambiente = dict(os.environ,PYTHONHASHSEED='0',MPLBACKEND='Agg')
+	with open(cartella / (script + '.log'),'w',encoding='utf8') as registro :
+		inizio = time.perf_counter()
+		p = subprocess.Popen([sys.executable,str(radice / (script + '.py')),str(configuratio)],cwd=cartella,env=ambiente,stdout=registro,stderr=subprocess.STDOUT)
+		_, stato, uso = os.wait4(p.pid,0)
+		tempo = time.perf_counter() - inizio
+	p.returncode = os.waitstatus_to_exitcode(stato)
+	if p.returncode != 0 :
+		raise RuntimeError('{} failed, see {}'.format(script,cartella / (script + '.log')))
+	return tempo, uso.ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+#
+
+#Outputs to be compared with the golden ones
+def risultati(cartella) :
+	return sorted(f.name for f in cartella.glob('*.tsv') if not f.name.startswith(aleatoria))
+#
+
+#Uninflected forms of a table written by Affixes.py, with the frequency of each lexeme
+def aclitica(percorso) :
+	formae = {}
+	with open(percorso,'r',encoding='utf8') as intro :
+		for riga in intro :
+			l, p, ff, n = riga.split('\t')[:4]
+			formae[(l,p)] = (tuple(ff.split(',')),int(n))
+	return formae
+#
+
+#Validation of the approximate collection of Affixes.py against the exact one, for every memory budget (in MiB): recall and precision of the uninflected forms, and excess of the frequencies of lexemes with the same forms, which can never be negative, and exceeds its bound (for every form, with the tokens of the treebank as total) only with a small probability
+def approssimare(conllu,tokens,lavoro,budgets) :
+	from Sketches import dividere
+	import math
+	esiti = {}
+	errori = []
+	cartella = lavoro / 'exact'
+	tempo, picco = lanciare('Affixes',configurare(cartella,conllu,{}),cartella)
+	esatte = aclitica(cartella / 'aclitica_xx.tsv')
+	formesatte = {(l,p,f) for (l,p),(ff,_) in esatte.items() for f in ff}
+	esiti['exact'] = {'seconds' : tempo, 'peak_rss_bytes' : picco, 'forms' : len(formesatte)}
+	print('{:<30}{:>10.3f} s{:>9.1f} MiB peak{:>8} uninflected forms'.format('exact Affixes',tempo,picco / 2**20,len(formesatte)))
+	for b in budgets :
+		variante = 'approximate {} MiB'.format(b)
+		cartella = lavoro / 'approximate-{}'.format(b)
+		tempo, picco = lanciare('Affixes',configurare(cartella,conllu,{'approximate' : b}),cartella)
+		approssimate = aclitica(cartella / 'aclitica_xx.tsv')
+		formapprossimate = {(l,p,f) for (l,p),(ff,_) in approssimate.items() for f in ff}
+		limite = math.e / dividere(b)[0] * tokens
+		eccessi = [(n - esatte[k][1],len(ff)) for k,(ff,n) in approssimate.items() if k in esatte and esatte[k][0] == ff]
+		esiti[variante] = {'seconds' : tempo, 'peak_rss_bytes' : picco, 'forms' : len(formapprossimate),\
+						   'recall' : len(formapprossimate & formesatte) / max(1,len(formesatte)), 'precision' : len(formapprossimate & formesatte) / max(1,len(formapprossimate)),\
+						   'bound' : limite, 'max_excess' : max([e / nf for e,nf in eccessi],default=0), 'beyond_bound' : sum(1 for e,nf in eccessi if e > limite * nf) / max(1,len(eccessi))}
+		print('{:<30}{:>10.3f} s{:>9.1f} MiB peak{:>8} uninflected forms, recall {:.3f}, precision {:.3f}, excess per form at most {:.1f} (bound {:.1f}, exceeded by {:.1%} of lexemes)'.format(variante,tempo,picco / 2**20,len(formapprossimate),esiti[variante]['recall'],esiti[variante]['precision'],esiti[variante]['max_excess'],limite,esiti[variante]['beyond_bound']))
+		if any(e < 0 for e,_ in eccessi) :
+			errori.append('{}: some frequencies are lower than the exact ones'.format(variante))
+	#
+	for e in errori :
+		print('MISMATCH ' + e)
+
+	return esiti, errori
+#
+
+#End-to-end benchmarks of the scripts in every configuration, checked against the golden outputs (or becoming them, if asked)
+def e2e(conllu,tokens,lavoro,aurea,aggiorna=False) :
+	esiti = {}
+	errori = []
+	for variante, parametri in varianti.items() :
+		cartella = lavoro / variante
+		configuratio = configurare(cartella,conllu,parametri)
+		for script in scripta :
+			tempo, picco = lanciare(script,configuratio,cartella)
+			esiti[variante + ' ' + script] = {'seconds' : tempo, 'tokens' : tokens, 'tokens/s' : tokens / tempo, 'peak_rss_bytes' : picco}
+			print('{:<30}{:>10.3f} s{:>14,.0f} tokens/s{:>9.1f} MiB peak'.format(variante + ' ' + script,tempo,tokens / tempo,picco / 2**20))
+		#
+		if aggiorna and variante == 'graph' :
+			aurea.mkdir(parents=True,exist_ok=True)
+			for vecchio in aurea.glob('*.tsv') :
+				vecchio.unlink()
+			for f in risultati(cartella) :
+				(aurea / f).write_bytes((cartella / f).read_bytes())
+			print('Golden outputs updated in {}'.format(aurea))
+		if aurea.exists() :
+			attesi = risultati(aurea)
+			if risultati(cartella) != attesi :
+				errori.append('{}: outputs {} instead of {}'.format(variante,risultati(cartella),attesi))
+			for f in attesi :
+				if (cartella / f).exists() and not filecmp.cmp(cartella / f,aurea / f,shallow=False) :
+					errori.append('{}: {} differs from the golden one'.format(variante,f))
+	#
+	if not aurea.exists() :
+		print('No golden outputs for these parameters in {}: run with --update to create them.'.format(aurea))
+	for e in errori :
+		print('MISMATCH ' + e)
+
+	return esiti, errori
+#
+
+
+if __name__ == '__main__' :
+
+	argomenti = argparse.ArgumentParser(description='Benchmarks on a synthetic treebank.')
+	argomenti.add_argument('--sentences',type=int,default=2000)
+	argomenti.add_argument('--seed',type=int,default=0)
+	argomenti.add_argument('--repeat',type=int,default=3,help='repetitions of micro-benchmarks (the best one counts)')
+	argomenti.add_argument('--only',choices=('micro','e2e','approximate'))
+	argomenti.add_argument('--budgets',default='64,1',help='memory budgets (in MiB, separated by commas) of the approximate collection to validate')
+	argomenti.add_argument('--workdir',help='directory for the synthetic treebank and the outputs (by default a temporary one)')
+	argomenti.add_argument('--json',help='file where to write the report')
+	argomenti.add_argument('--update',action='store_true',help='store the outputs of this run as the golden ones')
+	opzioni = argomenti.parse_args()
+	#
+	temporanea = None if opzioni.workdir else tempfile.TemporaryDirectory()
+	lavoro = Path(opzioni.workdir or temporanea.name).resolve()
+	lavoro.mkdir(parents=True,exist_ok=True)
+	conllu = synthesise(lavoro / 'synthetic-{}-{}.conllu'.format(opzioni.sentences,opzioni.seed),opzioni.sentences,opzioni.seed,morphologia=radice / 'Morphology')
+	aurea = Path(__file__).resolve().parent / 'Golden' / '{}-{}'.format(opzioni.sentences,opzioni.seed)
+	#
+	from CoNLLUToolsmini import readCoNLLU, syntacticwords
+	tokens = sum(1 for _,a in readCoNLLU(conllu,syntax=False,compact=True) for _ in syntacticwords(a))
+	print('Synthetic treebank: {} sentences, {} syntactic words (seed {})\n'.format(opzioni.sentences,tokens,opzioni.seed))
+	#
+	rapporto = {'sentences' : opzioni.sentences, 'seed' : opzioni.seed, 'tokens' : tokens, 'python' : sys.version.split()[0]}
+	errori = []
+	if opzioni.only in (None,'micro') :
+		rapporto['micro'] = micro(conllu,opzioni.repeat)
+		print()
+	if opzioni.only in (None,'e2e') :
+		rapporto['e2e'], errori = e2e(conllu,tokens,lavoro,aurea,opzioni.update)
+		rapporto['mismatches'] = errori
+		print()
+	if opzioni.only in (None,'approximate') :
+		rapporto['approximate'], errata = approssimare(conllu,tokens,lavoro,[float(b) for b in opzioni.budgets.split(',')])
+		errori = errori + errata
+		rapporto['mismatches'] = errori
+	#
+	if opzioni.json :
+		with open(opzioni.json,'w',encoding='utf8') as exo :
+			json.dump(rapporto,exo,indent=1)
+	if temporanea is not None :
+		temporanea.cleanup()
+	if errori :
+		sys.exit(1)
+#
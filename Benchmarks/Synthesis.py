@@ -0,0 +1,114 @@
+#The following code has been developed by Flavio Massimiliano Cecchini as part of the work presented in "Quid verbumst? Applying a definition of word to Latin in Universal Dependencies", SyntaxFest 2025, Ljubljana. Please give credit to the author if you use any part of it. 
+#Contact: flaviomassimiliano.cecchini at kuleuven.be
+
+#Seeded generator of synthetic, but realistic enough, CoNLL-U treebanks for benchmarks (see Benchmark.py): the same parameters always produce the same file
+
+import random
+from pathlib import Path
+
+#Distribution of parts of speech (roughly that of UD Latin), with the relations they usually bear and the features they usually have
+partes = {'NOUN' : (20,('nsubj','obj','obl','nmod','iobj','vocative','appos','conj','obl:arg','nsubj:pass'),('Case=Nom|Gender=Masc|Number=Sing','Case=Acc|Gender=Fem|Number=Plur','Case=Abl|Gender=Neut|Number=Sing','Case=Gen|Number=Plur','Case=Dat|Gender=Masc|InflClass=IndEurO|Number=Sing','Case=Nom|Gender=Fem|InflClass=IndEurA|Number=Sing','Case=Acc|InflClass=Ind|Number=Sing')),\
+		  'VERB' : (16,('root','ccomp','xcomp','advcl','acl','acl:relcl','csubj','parataxis','conj'),('Mood=Ind|Number=Sing|Person=3|Tense=Pres|VerbForm=Fin|Voice=Act','Mood=Sub|Number=Plur|Person=3|Tense=Past|VerbForm=Fin|Voice=Pass','VerbForm=Inf|Voice=Act','Case=Nom|Gender=Masc|Number=Sing|Tense=Past|VerbForm=Part|Voice=Pass','Aspect=Perf|Mood=Ind|Number=Sing|Person=1|Tense=Past|VerbForm=Fin','VerbForm=Ger|Case=Abl')),\
+		  'ADJ' : (8,('amod','conj','xcomp','nsubj','obl'),('Case=Nom|Degree=Pos|Gender=Masc|Number=Sing','Case=Acc|Degree=Cmp|Number=Plur','Case=Abl|Degree=Abs|Gender=Fem|Number=Sing','Case=Gen|Number=Plur|NumType=Ord','Case=Nom|Gender=Neut|InflClass=IndEurI|Number=Sing')),\
+		  'ADV' : (7,('advmod','discourse','mark','cc'),('_','Degree=Pos','Degree=Cmp','PronType=Rel','Polarity=Neg','NumType=Mult')),\
+		  'PRON' : (6,('nsubj','obj','obl','det','iobj','expl'),('Case=Nom|Number=Sing|Person=1|PronType=Prs','Case=Acc|Gender=Masc|Number=Sing|PronType=Rel','Case=Abl|Number=Plur|PronType=Dem','Case=Dat|PronType=Int,Rel')),\
+		  'DET' : (5,('det','nsubj','obj'),('Case=Nom|Gender=Masc|Number=Sing|PronType=Dem','Case=Acc|Number=Plur|PronType=Tot','Case=Abl|PronType=Ind')),\
+		  'AUX' : (3,('aux','cop','aux:pass','root'),('Mood=Ind|Number=Sing|Person=3|Tense=Pres|VerbForm=Fin','VerbForm=Inf','Mood=Sub|Number=Plur|Person=3|Tense=Past|VerbForm=Fin')),\
+		  'ADP' : (5,('case','fixed'),('_','AdpType=Prep','AdpType=Post')),\
+		  'CCONJ' : (5,('cc','fixed'),('_',)),\
+		  'SCONJ' : (3,('mark',),('_',)),\
+		  'PART' : (2,('advmod','discourse'),('_','Polarity=Neg','PartType=Int')),\
+		  'NUM' : (1,('nummod','det'),('NumForm=Word|NumType=Card','NumForm=Digit|NumType=Card','NumForm=Roman|NumType=Card','NumType=Dist')),\
+		  'PROPN' : (3,('nsubj','obj','obl','flat','flat:name','vocative'),('Case=Nom|Gender=Masc|Number=Sing','Case=Gen|Number=Sing','Abbr=Yes|Case=Nom')),\
+		  'INTJ' : (1,('discourse','root'),('_',)),\
+		  'PUNCT' : (12,('punct',),('_',)),\
+		  'X' : (1,('dep','flat','orphan'),('_','Foreign=Yes')),\
+		  'SYM' : (1,('dep',),('_',)),\
+		 }
+#Values found in MISC
+miscellanea = ('SpaceAfter=No','LASLAVariant=Yes','LiLaflcat=n_1','CitationHierarchy=1.2','Form=Adverbial','InflClass=Ind','NounClass=IndEurO')
+#Syllables for invented lemmas, and endings for their forms
+syllabae = ('a','am','an','ar','ca','ce','ci','co','cu','da','de','di','do','du','fa','fe','fi','ge','ha','i','ia','in','la','le','li','lo','lu','ma','me','mi','mo','mu','na','ne','ni','no','nu','pa','pe','pi','po','qui','ra','re','ri','ro','ru','sa','se','si','so','su','ta','te','ti','to','tu','ua','ue','ui','uo','ex','con','per','prae')
+terminationes = {'NOUN' : ('a','ae','am','us','i','um','o','is','em','ibus'), 'PROPN' : ('us','i','o','um','a','ae'), 'VERB' : ('o','as','at','amus','ant','ere','it','unt','avit','atus','ari'), 'AUX' : ('est','sunt','esse','erat','fuit'), 'ADJ' : ('us','a','um','i','ae','is','ior','issimus')}
+punctuationes = ('.',',',';',':','?','!')
+
+#Shapes of trees: attachment of every word to a random previous one, to the previous one (chain), to the first one (flat), or to a random one among the last few (local, the most realistic one)
+formae = {'random' : lambda i,r : r.randint(1,i-1), 'chain' : lambda i,r : i-1, 'flat' : lambda i,r : 1, 'local' : lambda i,r : max(1,i-r.randint(1,3))}
+
+#Generates a CoNLL-U file in the given path. Sentence lengths follow a geometric distribution with the given mean (plus some single-word sentences); shapes is a dictionary of weights of the shapes above; the other parameters are probabilities (per sentence for multiword tokens and absence of syntax, per token for FEATS and MISC)
+#Lemmas are partly invented, partly drawn from the morphological resources (if a directory is given), so that derivation and remapping of adverbs are exercised too
+def synthesise(path,sentences=1000,seed=0,length=8,single=0.1,shapes={'local':6,'random':2,'chain':1,'flat':1},mwt=0.1,feats=0.8,misc=0.3,unannotated=0.3,morphologia=None,vocabulary=3000) :
+	
+	r = random.Random(seed)
+	
+	#Vocabulary by part of speech, with some real lemmas when available
+	reali = []
+	if morphologia is not None :
+		for f in ('derived','compound') :
+			if (Path(morphologia) / f).exists() :
+				with open(Path(morphologia) / f,'r',encoding='utf8') as intro :
+					reali.extend(sorted({riga.strip() for riga in intro if riga.strip()}))
+		if (Path(morphologia) / 'ADV.tsv').exists() :
+			with open(Path(morphologia) / 'ADV.tsv','r',encoding='utf8') as intro :
+				reali.extend(sorted({riga.split('\t')[0].strip() for riga in intro if riga.strip()}))
+	reali = r.sample(reali,min(len(reali),vocabulary//3))
+	#
+	lexicon = {}
+	for p in partes :
+		lexicon[p] = [''.join(r.choice(syllabae) for _ in range(r.randint(1,4))) for _ in range(max(5,vocabulary*partes[p][0]//100))]
+	for l in reali :
+		lexicon[r.choice(('NOUN','VERB','ADJ','ADV','ADV'))].append(l)
+	lexicon['PUNCT'] = list(punctuationes)
+	lexicon['NUM'].extend(['2','10','XII','1-2'])
+	lexicon['PROPN'] = [l.capitalize() for l in lexicon['PROPN']]
+	#
+	pos = list(partes)
+	pondera = [partes[p][0] for p in pos]
+	shapenames = list(shapes)
+	shapeweights = [shapes[s] for s in shapenames]
+	
+	with open(path,'w',encoding='utf8') as exo :
+		for s in range(sentences) :
+			
+			if s % 100 == 0 :
+				exo.write('# newdoc id = synthetic-{}\n'.format(s//100))
+			exo.write('# sent_id = synthetic-{}\n'.format(s))
+			
+			n = 1 if r.random() < single else min(60,1 + int(r.expovariate(1/max(1,length-1))))
+			syntax = r.random() >= unannotated
+			shape = formae[r.choices(shapenames,shapeweights)[0]]
+			
+			tokens = []
+			for i in range(1,n+1) :
+				p = r.choices(pos,pondera)[0] if n > 1 or r.random() < 0.5 else r.choice(('NOUN','VERB','INTJ','ADV'))
+				lemma = r.choice(lexicon[p])
+				form = lemma + r.choice(terminationes[p]) if p in terminationes and r.random() < 0.7 else lemma
+				if r.random() < 0.03 :
+					form = form.upper()
+				if r.random() < 0.02 :
+					form = form.replace('u','v').replace('i','j')
+				head = (0 if i == 1 else shape(i,r)) if syntax else '_'
+				deprel = ('root' if i == 1 else r.choice(partes[p][1])) if syntax else '_'
+				if deprel == 'root' and i > 1 :
+					deprel = 'parataxis'
+				tokens.append([str(i),form,lemma,p,'_',r.choice(partes[p][2]) if r.random() < feats else '_',str(head),deprel,'_','|'.join(sorted(r.sample(miscellanea,r.randint(1,2)))) if r.random() < misc else '_'])
+			#
+			exo.write('# text = {}\n'.format(' '.join(t[1] for t in tokens)))
+			for i,t in enumerate(tokens,1) :
+				if n > 1 and i < n and r.random() < mwt/n : #multiword token spanning this word and the next one
+					exo.write('{}-{}\t{}\t_\t_\t_\t_\t_\t_\t_\t_\n'.format(i,i+1,t[1]+tokens[i][1]))
+				exo.write('\t'.join(t) + '\n')
+			exo.write('\n')
+	#
+	
+	return path
+#
+
+#Usage: python Synthesis.py <output> [sentences] [seed]
+if __name__ == '__main__' :
+	import sys
+	if len(sys.argv) < 2 :
+		print('Please specify the path of the synthetic treebank to generate (followed by the number of sentences and the seed, if needed).')
+		quit()
+	synthesise(sys.argv[1],sentences=int(sys.argv[2]) if len(sys.argv) > 2 else 1000,seed=int(sys.argv[3]) if len(sys.argv) > 3 else 0,morphologia=Path(__file__).resolve().parent.parent / 'Morphology')
+#
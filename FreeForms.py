@@ -2,11 +2,10 @@
 #Contact: flaviomassimiliano.cecchini at kuleuven.be
 
 #Useful imports
-import sys, os, configparser, regex, dill, json, random
+import sys, os, configparser, regex
 from pathlib import Path
 from operator import itemgetter
 from collections import defaultdict, Counter, namedtuple
-from matplotlib import pyplot as plt
 #
 
 #Inputs, specifications and data
@@ -19,9 +18,24 @@ except (IndexError) :
 confs = configparser.ConfigParser(delimiters='\t',comment_prefixes='#',inline_comment_prefixes='#')
 confs.read(Path(configurationes))
 #
+argomenti = sys.argv[2:]
+fragmenta = argomenti[argomenti.index('merge') + 1:] if 'merge' in argomenti else [] #files of partial results merged instead of reading the treebank (see Partials and Quid.py merge)
+argomenti = argomenti[:argomenti.index('merge')] if 'merge' in argomenti else argomenti
+opera = set(argomenti) or {'singleforms','freeforms','plot'} #tasks to carry out, all by default (see also Quid.py)
+if opera - {'singleforms','freeforms','plot'} :
+	print('Unknown tasks: {} (singleforms, freeforms, plot).'.format(', '.join(sorted(opera - {'singleforms','freeforms','plot'}))))
+	quit()
+if not argomenti and not confs.getboolean('Parameters','plot',fallback=True) :
+	opera.discard('plot')
+#
 tools = Path(confs.get('Tools','reader')).resolve()
 sys.path.append(os.path.abspath(tools))
-from CoNLLUToolsmini import UDPos, readCoNLLU, syntacticwords, conllunode, readUDfeatures, writeUDfeatures, extractnucleus, featsfusion
+from CoNLLUToolsmini import UDPos, Consumer, traverseCoNLLU, incrementCoNLLU, hashCoNLLU, selectCoNLLU, selectionfiles, hassyntax, syntacticwords, writeUDfeatures, featsfold
+from Resources import loadresources, loadradicalforms
+from Metrics import Mensura
+from Columnar import formatum, columnar
+from Nuclei import definitiones, clausalia, tabulafreeforms
+from Partials import writepartial, loadpartials
 normo = Path(confs.get('Tools','normaliser')).resolve()
 sys.path.append(os.path.abspath(normo))
 try : 
@@ -29,82 +43,75 @@ try :
 	normalizator = orthonormalizatio
 except ImportError :
 	normalizator = lambda x : x.lower()
+try : 
+	from Normaliser import orthonormalizationes #batch version, if available
+	normalizatores = orthonormalizationes
+except ImportError :
+	normalizatores = lambda xx : list(map(normalizator,xx))
 #
 conllu = Path(confs.get('Data','conllu')).resolve()
-print('Extracting data from: {}\n'.format(conllu))
+print('Merging partial results from: {}\n'.format(', '.join(fragmenta)) if fragmenta else 'Extracting data from: {}\n'.format(conllu))
 morphologia = Path(confs.get('Data','derivation')).resolve()
 #
 ydioma = confs.get('Parameters','lang')
+compacta = confs.getboolean('Parameters','compact',fallback=False) #lighter trees instead of Networkx graphs
+memoria = confs.getboolean('Parameters','cache',fallback=False) #binary cache of the parsed treebank
+incrementa = confs.getboolean('Parameters','incremental',fallback=False) #only new or modified sentences are processed with respect to the previous run
+metrica = confs.getboolean('Parameters','metrics',fallback=False) #timings, counts and peak memory of every stage, written to a JSON file
+profilo = confs.get('Parameters','profile',fallback='none') #cprofile or tracemalloc, for a deeper (and slower) profiling stored with the metrics
+colonnare = formatum(confs.get('Parameters','columnar',fallback='none')) #typed columnar copies of the tables, checked at once (see Columnar)
+selezione = selectCoNLLU(confs.get('Parameters','select',fallback='all')) #only sentences whose metadata satisfy some conditions are read, the others being skipped before their rows are parsed (see selectCoNLLU)
+parziale = confs.getboolean('Parameters','partial',fallback=False) #the aggregates are also written to a file of partial results, to be merged with those of other parts of the treebank (see Partials)
+vestigium = repr((sorted(confs.items('Parameters')),[hashCoNLLU(f) for f in (Path(__file__),tools / 'CoNLLUToolsmini.py',tools / 'Nuclei.py',tools / 'Resources.py',normo / 'Normaliser.py',morphologia / 'ADV.tsv',morphologia / 'udeprels.json') if f.exists()] + [hashCoNLLU(f) for f in selectionfiles(confs.get('Parameters','select',fallback='all'))])) #anything which could change the results of an incremental run
+impronta = repr((ydioma,[hashCoNLLU(f) for f in (normo / 'Normaliser.py',morphologia / 'ADV.tsv',morphologia / 'udeprels.json') if f.exists()])) #anything which could change the aggregates of a partial run, which can then be merged with others having the same
+#
+
+
+mensura = Mensura('FreeForms','_'.join(('metrics','freeforms',ydioma)) + '.json',profilo,scribere=metrica) #see Metrics
 #
 
 
 #Definition of structures and import of word lists
-syntagmata = defaultdict(lambda : defaultdict(list))
-singula = defaultdict(lambda : defaultdict(lambda : defaultdict(lambda : defaultdict(list))))
-freeheadpos = dict()
-randoff = {}
+syntagmata = defaultdict(lambda : defaultdict(dict)) #types of nuclei of every lexeme, with their sentences (in order of insertion, see tabulafreeforms) and relations
+singula = defaultdict(lambda : defaultdict(lambda : defaultdict(lambda : {'sent' : [], 'morph' : defaultdict(Counter)}))) #sentences and fused features of every single form
 radnum = 0
 sentnum = 0
 #
-advpos = {}
-with open(morphologia / 'ADV.tsv','r',encoding='utf8') as intro : 
-	for riga in intro :
-		l,p = riga.strip(' \n').split('\t')
-		advpos[normalizator(l)] = 'PRON' if p == 'REL' else p #See paper for this decision. The ADV treatment is specific for Latin, but can possibly readapted to other languages
-#
-allbdeprel = set()
-with open(morphologia / 'udeprels.json','r',encoding='utf8') as intus : 
-	allbdeprel = set(json.load(intus)['udeprels'])
+with mensura.stage('resources') :
+	risorse = loadresources(morphologia,normalizator,normalizatores,lang=ydioma) #compiled only once, see Resources
+advpos = risorse.advpos
+allbdeprel = risorse.allbdeprel
 #	
 corrpos = {'PROPN': lambda x : 'NOUN', 'ADV' : lambda x : advpos.get(x,'ADV') , 'NUM' : lambda x : 'DET'} #Remapping of part-of-speech tags; see paper. This is valid universally (except for ad hoc treatment of ADV)
-funcpos = {p for p,v in UDPos.items() if 'syn' in v}
 alexpos = {p for p,v in UDPos.items() if 'alex' in v}
-lexpos = UDPos.keys() - alexpos
-phrasalia = ('csubj','ccomp','xcomp','advcl','acl','parataxis')
-argumenta = ('nsubj','obj','iobj','csubj','ccomp','xcomp','obl','vocative','expl','dislocated','advcl','advmod','discourse')
-aphrasalia = allbdeprel.difference(phrasalia)
-singularia = allbdeprel.difference({'parataxis'}) 
-sincipita = ('fixed','flat')
+definitio = definitiones(allbdeprel) #relations and parts of speech defining clausal free forms, see Nuclei (where they can also be changed without reading the treebank again)
+criteria = (definitio['nucleus'],definitio['subtree']) #nucleus of a clause, and its subtree without parataxis
+argumenta = definitio['arguments']
+campi = ('form','lemma','upos','feats') + (('head','deprel') if 'freeforms' in opera or incrementa else ()) #the only columns read (see readCoNLLU): single forms need no syntax
 #
 
 
 # Identification and extraction of free forms
 
 ##The following search for radical forms among the lexicon is ad hoc for Latin and uses a specific resource (LatInfLexi). It might need adjustments according to the evolution of that resources (e.g. inclusion of further parts of speech).
+#Radical forms are computed once and for all, as the other resources (see Resources)
 if ydioma == 'la' : 
 
-	flexionarium = defaultdict(lambda : defaultdict(set))
-	flpos = {'n':'NOUN','v':'VERB'}	
-	
-	with open(morphologia / 'LatInfLexi-forms.csv','r',encoding='utf8') as intro : 
-		next(intro)
-		for riga in intro :
-			f,l,m,of,pf,*_ = map(lambda x : x.strip('"'),riga.strip().split(','))
-			ll,lp = l.split('_')
-			flexionarium[(ll,flpos[lp])][pf.replace(' ','').replace('ˈ','')].add(m) 
-	#
-
-	radicalia = defaultdict(lambda : defaultdict(set))
+	with mensura.stage('radicalforms') :
+		radicalia = loadradicalforms(morphologia)
 	
-	for l,ff in flexionarium.items() : 
-		communis = os.path.commonprefix(list(ff.keys()))
-		if communis in ff : 
-			radicalia[l[1]][tuple(sorted(ff[communis]))].add((l[0],communis))
-	#		
-	
-	with open('_'.join(('radicalforms',ydioma)) + '.tsv','w',encoding='utf8') as exo : 
+	with mensura.stage('radicalforms TSV'), open('_'.join(('radicalforms',ydioma)) + '.tsv','w',encoding='utf8') as exo, columnar('_'.join(('radicalforms',ydioma)),(('pos','dict'),('cells','list'),('lemma','dict'),('form','string')),colonnare) as colonne : 
 		for p,casi in radicalia.items() :
 			for m,ll in casi.items() : 
 				for l,f in sorted(ll,key = lambda x : regex.sub(r'\d','',x[0])[::-1]) : 
 					exo.write('{}\t{}\t{}\t{}\n'.format(p,','.join(m),l,f))
+					colonne.append(p,m,l,f)
 	#
 ##
 
-#Extraction of single-word sentences: syntax is not required
-for s,a in readCoNLLU(conllu,syntax=False) :	
+#Extraction of single-word sentences: syntax is not required. It returns the contribution of the sentence to singula, if any
+def singleformae(s,a) :
 	
-	print(s['sent_id'],end='\r')
-
 	ln = [n for n in syntacticwords(a) if n.upos not in alexpos]
 	
 	if len(ln) == 1 :
@@ -115,123 +122,142 @@ for s,a in readCoNLLU(conllu,syntax=False) :
 		
 		cupos = corrpos.get(l.upos, lambda x : l.upos)(ortholemma)
 		
-		singula[cupos][ortholemma][orthoforma]['sent'].append(s['sent_id'])
-		singula[cupos][ortholemma][orthoforma]['morph'].append(l.feats)
-#
-
-with open('_'.join(('singleforms',ydioma)) + '.tsv','w',encoding='utf8') as exo :
-	for p,lfd in singula.items() :															 
-		for l,fd in lfd.items() :
-			for f,d in fd.items() :				
-				omnimorpho = featsfusion(d['morph'])
-				exo.write('{}\t{}\t{}\t{}\t{}\n'.format(p,\
-								   						l,\
-														f,\
-								   						writeUDfeatures(omnimorpho),\
-								   						','.join(d['sent'])\
-												   		))		
-##
+		return (cupos,ortholemma,orthoforma,s['sent_id'],l.feats)
+#
 
-##Two-step extraction of clausal free forms: syntax is needed #NB: if the syntax parameter of readCoNLLU is true, sentences without syntactic annotation are simply not yielded (= they are ignored)
-for s,a in readCoNLLU(conllu,syntax=True) :	
+##Two-step extraction of clausal free forms: syntax is needed (see clausalia). It returns the number of roots not in a co-ordination, and the contributions of the sentence to syntagmata
+def nuclei(s,a) :
 	
-	sentnum += 1
+	radices, liberae = clausalia(a,criteria,argumenta,corrpos)
+	formae = []
 	
-	print(s['sent_id'],end='\r')
+	for l,nucleus in liberae : 
+		ortholemma = normalizator(l.lemma)
+		formae.append((corrpos.get(l.upos, lambda x : l.upos)(ortholemma),ortholemma,s['sent_id'],nucleus._replace(forms=tuple(normalizatores(nucleus.forms)))))
 	
-	for l in syntacticwords(a) : 
-		
-		brel = l.deprel.split(':')[0] 
-			
-		#We start the extraction from roots, but exclude those that are found in a co'ordination
-		if brel == 'root' and not any([conllunode(a,nd).deprel.split(':')[0] == 'conj' for nd in a[l.id]]) : 
-					
-			radnum += 1
-			
-			nucleus = extractnucleus(a,l.id,funcrel=aphrasalia,funcpos=funcpos,multi=sincipita) #we ignore possible conjuncts of dependents (e.g. "can [and must] work"; "this [and that] thing") 
-			bnrels = {dr.split(':')[0] for dr in nucleus.deprels}
-			subarbor = extractnucleus(a,l.id,funcrel=singularia,funcpos=lexpos,multi=sincipita)
-
-			#We check that we really just have a sentence coinciding with a nucleus, in other words, a simple clause with no extensions or nested clauses (ignoring co-ordination). We further exclude marked elliptical structures (orphan); require the clause to be "finite" (this criterion might need adjustments for different languages in the current state of UD annotation); and given the unclear status of ADV (straddling the grammaticality cline), we exclude clauses which have an ADV in the arguments, since we require only the head be autosemantic, if ever 
-			if not set(subarbor.ids).difference(nucleus.ids) \
-			and 'orphan' not in bnrels \
-			and ('Fin' in nucleus.feats.get('VerbForm',()) or bnrels.intersection(argumenta)) \
-			and not any([corrpos['ADV'](nucleus.lemmas[i]) == 'ADV' for i,d in enumerate(nucleus.ids) if d != l.id and nucleus.upos[i] == 'ADV']) : 
-				ortholemma = normalizator(l.lemma)
-				syntagmata[corrpos.get(l.upos, lambda x : l.upos)(ortholemma)][ortholemma].append((s['sent_id'],nucleus._replace(forms=tuple(map(normalizator,nucleus.forms)))))
-#
-
-##Writing and creation of objects for plotting
-with open('_'.join(('freeforms',ydioma)) + '.tsv','w',encoding='utf8') as exo :
-	for p,lnnn in syntagmata.items() :
-		
-		numtypi = 0
-		numsingtypi = 0
-		numlemmasing = 0
-		
-		for l,nnn in lnnn.items() :
-			ntypi = defaultdict(lambda : defaultdict(set))
-			for s,n in nnn :
-				ntypi[' '.join(n.forms)]['sent'].add(s)
-				ntypi[' '.join(n.forms)]['rel'].update(map(lambda x : x.split(':')[0],n.deprels))
-			#	
-			
-			numtypi += len(ntypi)
-			sing = len([n for n in ntypi if len(n.split()) == 1])
-			numlemmasing += 1 if sing else 0
-			numsingtypi += sing
-			
-			randoff[p] = random.choice(list(ntypi.keys()))
-			
-			for n,sr in ntypi.items() : 				
-				exo.write('{}\t{}\t{}\t{}\t{}\t{}\n'.format(p,\
-								   					l,\
-													n,\
-								   					len(n.split()),\
-								   					len(ntypi[n]),\
-													','.join(sr['sent'])\
-												   ))
-		#		
-		freeheadpos[p] = (numtypi,numsingtypi,len(lnnn),numlemmasing)			
-#
-
-##Handy statistics
-print('The syntactically annotated part of the treebank contains {} sentences, of which {} do not have a root co-ordination.\n'.format(sentnum,radnum))
-print('The {} extracted clausal free forms ({} consisting of a single form) are headed by {} distinct lexemes ({} for single-form clausal free forms). NB: these figures are computed only on the syntactically annotate part of the treebank).\n'.format(sum(map(itemgetter(0),freeheadpos.values())),sum(map(itemgetter(1),freeheadpos.values())),sum(map(itemgetter(2),freeheadpos.values())),sum(map(itemgetter(3),freeheadpos.values()))))
-print('Here is a random example for each part of speech appearing as head (beware that data might be noisy or incorrect, always check it!):\n')
-for p,ex in randoff.items() :
-	print('- {}:\t{}'.format(p,ex))
-#
-
-
-# Plotting
-
-posord = sorted(UDPos.keys() - alexpos - {'PROPN','NUM','X'}, key = lambda x : freeheadpos.get(x,(0,0,0,0))[2],reverse=True) #Attention: this is rather ad hoc with respect to the function corrpos, might need adaptation if you want to keep/visualise specific POS
-colores = {p : {'omnia': 'r' if 'auto' in UDPos[p] else 'm', 'sing': 'b' if 'auto' in UDPos[p] else 'c'} for p in posord}
-#
-data = [freeheadpos.get(p,(0,0,0,0))[2] for p in posord]
-datasing = [freeheadpos.get(p,(0,0,0,0))[3] for p in posord]
-datafreesing = [len(singula[p]) for p in posord]
-datafreemorph = [0]*len(posord)
-
-plt.figure(1)
-plt.bar(posord,datasing,color=[colores[p]['sing'] for p in posord])
-plt.bar(posord,[ data[i] - datasing[i] for i,p in enumerate(posord)],bottom=datasing,color=[colores[p]['omnia'] for p in posord])
-plt.xticks(range(len(posord)), posord)
-plt.xticks(rotation=60)
-#
-plt.savefig('_'.join(('freeformdistr',ydioma)) + '.png',bbox_inches='tight')
-plt.show()
-#
-
-plt.figure(2)
-plt.bar(posord,datafreemorph,color=[colores[p]['sing'] for p in posord])
-plt.bar(posord,[ datafreesing[i] - datafreemorph[i] for i,p in enumerate(posord)],bottom=datafreemorph,color=[colores[p]['omnia'] for p in posord])
-plt.xticks(range(len(posord)), posord)
-plt.xticks(rotation=60)
-#
-plt.savefig('_'.join(('freesingformdistr',ydioma)) + '.png',bbox_inches='tight')
-plt.show()
+	return radices, formae
+#
 
+#Contribution of a sentence to both extractions (the second one only if syntactically annotated)
+def contributio(s,a) :
+	return singleformae(s,a), nuclei(s,a) if hassyntax(a) else None
+#
 
+#Collection of the contributions of a sentence into the global structures. Features and nuclei are folded at once into what is written at the end (see featsfold), so that memory grows with the number of types, not of occurrences
+def colligere(singulum,nucleare) :
+	
+	global sentnum, radnum
+	
+	if singulum :
+		cupos,ortholemma,orthoforma,sentid,morph = singulum
+		singula[cupos][ortholemma][orthoforma]['sent'].append(sentid)
+		featsfold(singula[cupos][ortholemma][orthoforma]['morph'],morph)
+	#
+	if nucleare is not None :
+		sentnum += 1
+		radices, formae = nucleare
+		radnum += radices
+		for cupos,ortholemma,sentid,nucleus in formae :
+			typus = syntagmata[cupos][ortholemma].setdefault(' '.join(nucleus.forms),{'sent' : {}, 'rel' : set()})
+			typus['sent'][sentid] = None
+			typus['rel'].update(map(lambda x : x.split(':')[0],nucleus.deprels))
+#
+
+#Aggregates of the global structures, as plain dictionaries, to be written to a file of partial results (see Partials)
+def aggregata() :
+	return {'singula' : {p : {l : {f : {'sent' : d['sent'], 'morph' : dict(d['morph'])} for f,d in fd.items()} for l,fd in lfd.items()} for p,lfd in singula.items()},\
+			'syntagmata' : {p : {l : nn for l,nn in lnn.items()} for p,lnn in syntagmata.items()},\
+			'sentnum' : sentnum, 'radnum' : radnum, 'numeri' : (mensura.sententiae,mensura.tokens)}
+#
+
+#Merging of the aggregates of a file of partial results into the global structures, as if its sentences were read after the ones already collected
+def miscere(parte) :
+
+	global sentnum, radnum
+
+	for cupos,lfd in parte['singula'].items() :
+		for ortholemma,fd in lfd.items() :
+			for orthoforma,d in fd.items() :
+				singulum = singula[cupos][ortholemma][orthoforma]
+				singulum['sent'].extend(d['sent'])
+				for k,c in d['morph'].items() :
+					singulum['morph'][k].update(c)
+	for cupos,lnn in parte['syntagmata'].items() :
+		for ortholemma,nn in lnn.items() :
+			for n,t in nn.items() :
+				typus = syntagmata[cupos][ortholemma].setdefault(n,{'sent' : {}, 'rel' : set()})
+				typus['sent'].update(t['sent'])
+				typus['rel'].update(t['rel'])
+	sentnum += parte['sentnum']
+	radnum += parte['radnum']
+	mensura.sententiae += parte['numeri'][0]
+	mensura.tokens += parte['numeri'][1]
+#
+
+##Both extractions share a single reading of the treebank, either complete, or incremental with respect to the previous one (only new or modified sentences are processed again), or are merged from partial results of several readings #NB: sentences without syntactic annotation are simply not passed on to the extraction of clausal free forms (= they are ignored)
+if fragmenta :
+	with mensura.stage('merging') as stadium :
+		for parte in loadpartials(fragmenta,'FreeForms',impronta,opera - {'plot'}) :
+			miscere(parte)
+		stadium.count(sentences=mensura.sententiae,tokens=mensura.tokens)
+elif incrementa :
+	with mensura.stage('reading') as stadium :
+		contributiones, novae = incrementCoNLLU(conllu,'_'.join(('incrementum','freeforms',ydioma)) + '.pickle',mensura.wrap('extraction',contributio),fingerprint=vestigium,syntax=False,compact=compacta,intern=True,fields=campi,lazy=True,select=selezione)
+		stadium.count(sentences=len(contributiones))
+	print('{} new or modified sentences out of {}.\n'.format(novae,len(contributiones)))
+	with mensura.stage('aggregation') :
+		for c in contributiones :
+			if c is not None :
+				colligere(*c)
+else :
+	consumptores = [Consumer(lambda s,a : mensura.progress(s['sent_id'],sum(1 for _ in syntacticwords(a))))]
+	if 'singleforms' in opera :
+		consumptores.append(Consumer(mensura.wrap('singleforms',lambda s,a : colligere(singleformae(s,a),None))))
+	if 'freeforms' in opera :
+		consumptores.append(Consumer(mensura.wrap('nuclei',lambda s,a : colligere(None,nuclei(s,a))),syntax=True))
+	with mensura.stage('reading') as stadium :
+		traverseCoNLLU(conllu,consumptores,compact=compacta,cache=memoria,intern=True,fields=campi,lazy=True,select=selezione)
+		stadium.count(sentences=mensura.sententiae,tokens=mensura.tokens)
+if parziale :
+	with mensura.stage('partial') :
+		writepartial('_'.join(('partial','freeforms',ydioma)) + '.gz','FreeForms',impronta,{'singleforms','freeforms'} if incrementa else opera - {'plot'},aggregata(),treebank=conllu)
+#
+
+if 'singleforms' in opera :
+	with mensura.stage('singleforms TSV'), open('_'.join(('singleforms',ydioma)) + '.tsv','w',encoding='utf8') as exo, columnar('_'.join(('singleforms',ydioma)),(('pos','dict'),('lemma','dict'),('form','string'),('feats','feats'),('sentences','list')),colonnare) as colonne :
+		for p,lfd in singula.items() :															 
+			for l,fd in lfd.items() :
+				for f,d in fd.items() :				
+					omnimorpho = dict(d['morph'])
+					exo.write('{}\t{}\t{}\t{}\t{}\n'.format(p,\
+									   						l,\
+															f,\
+									   						writeUDfeatures(omnimorpho),\
+									   						','.join(d['sent'])\
+													   		))
+					colonne.append(p,l,f,omnimorpho,d['sent'])
+##
+
+##Writing and statistics
+if 'freeforms' in opera :
+	with mensura.stage('freeforms TSV') :
+		freeheadpos, randoff = tabulafreeforms(syntagmata,'_'.join(('freeforms',ydioma)),colonnare) #see Nuclei
+	#
+
+	##Handy statistics
+	print('The syntactically annotated part of the treebank contains {} sentences, of which {} do not have a root co-ordination.\n'.format(sentnum,radnum))
+	print('The {} extracted clausal free forms ({} consisting of a single form) are headed by {} distinct lexemes ({} for single-form clausal free forms). NB: these figures are computed only on the syntactically annotate part of the treebank).\n'.format(sum(map(itemgetter(0),freeheadpos.values())),sum(map(itemgetter(1),freeheadpos.values())),sum(map(itemgetter(2),freeheadpos.values())),sum(map(itemgetter(3),freeheadpos.values()))))
+	print('Here is a random example for each part of speech appearing as head (beware that data might be noisy or incorrect, always check it!):\n')
+	for p,ex in randoff.items() :
+		print('- {}:\t{}'.format(p,ex))
+	#
+
+
+# Plotting, from the tables just written (see Plotting); it can also be done later with Quid.py plot
+if 'plot' in opera :
+	from Plotting import plotfreeforms
+	with mensura.stage('plotting') :
+		plotfreeforms(ydioma)
+#
 
+mensura.dump()
@@ -0,0 +1,159 @@
+#The following code has been developed by Flavio Massimiliano Cecchini as part of the work presented in "Quid verbumst? Applying a definition of word to Latin in Universal Dependencies", SyntaxFest 2025, Ljubljana. Please give credit to the author if you use any part of it.
+#Contact: flaviomassimiliano.cecchini at kuleuven.be
+
+#Command line for the single tasks of the scripts, each importing only what it needs:
+#	python Quid.py singleforms <configuration>	single-word sentences (FreeForms.py, no syntax needed)
+#	python Quid.py freeforms <configuration>	clausal free forms (FreeForms.py)
+#	python Quid.py underived <configuration>	underived lexemes (Affixes.py)
+#	python Quid.py aclitica <configuration>	uninflected forms (Affixes.py)
+#	python Quid.py plot <configuration> [directory]	plots of free forms, drawn from the tables in the directory (by default the current one), without any window
+#	python Quid.py index <configuration>	index of the syntactically annotated sentences for clausal free forms (nuclei_*.sqlite, see Nuclei), read once from the treebank (only the selected ones, see select)
+#	python Quid.py query <configuration> [definition.json ...]	clausal free forms extracted again from the index with other definitions (by default the one of the paper), each written to freeforms_*_<name of the definition>.tsv; see Nuclei.definire for their format
+#	python Quid.py merge <configuration> <partial> [<partial> ...]	tables, statistics and plots of a single run over the parts of the treebank whose partial results are given, in order (written with partial True, see Partials)
+#Several extraction tasks of the same script can be given at once, separated by commas (e.g. singleforms,freeforms), so that the treebank is read only once. Outputs are written in the current directory, as with the scripts
+
+#Useful imports
+import sys, runpy
+from pathlib import Path
+#
+
+scripta = {'singleforms' : 'FreeForms', 'freeforms' : 'FreeForms', 'underived' : 'Affixes', 'aclitica' : 'Affixes'}
+#
+
+#Launches a script on some of its tasks, as if from the command line
+def estrarre(opera,configuratio) :
+	script = {scripta[o] for o in opera}
+	if len(script) > 1 :
+		print('Tasks of different scripts cannot be combined: {}.'.format(', '.join(opera)))
+		sys.exit(2)
+	script = Path(__file__).resolve().parent / (script.pop() + '.py')
+	sys.argv = [str(script),str(configuratio)] + list(opera)
+	runpy.run_path(str(script),run_name='__main__')
+#
+
+#Launches the script which wrote some files of partial results on the tasks they all contain, merging them instead of reading the treebank
+def fondere(configuratio,*fragmenta) :
+	import configparser
+	confs = configparser.ConfigParser(delimiters='\t',comment_prefixes='#',inline_comment_prefixes='#')
+	confs.read(Path(configuratio))
+	sys.path.append(str(Path(confs.get('Tools','reader')).resolve()))
+	from Partials import partialheader
+	capita = [partialheader(f) for f in fragmenta]
+	script = {c['script'] for c in capita}
+	if len(script) > 1 :
+		print('Partial results of different scripts cannot be merged: {}.'.format(', '.join(sorted(script))))
+		sys.exit(2)
+	opera = sorted(set.intersection(*[set(c['tasks']) for c in capita]))
+	if not opera :
+		print('The partial results have no task in common.')
+		sys.exit(2)
+	script = script.pop()
+	if script == 'FreeForms' and confs.getboolean('Parameters','plot',fallback=True) :
+		opera.append('plot')
+	script = Path(__file__).resolve().parent / (script + '.py')
+	sys.argv = [str(script),str(configuratio)] + opera + ['merge'] + [str(Path(f).resolve()) for f in fragmenta]
+	runpy.run_path(str(script),run_name='__main__')
+#
+
+#Configuration, with the tools, the normaliser and the morphological resources loaded as in the scripts
+def preparare(configuratio) :
+	import configparser
+	confs = configparser.ConfigParser(delimiters='\t',comment_prefixes='#',inline_comment_prefixes='#')
+	confs.read(Path(configuratio))
+	sys.path.append(str(Path(confs.get('Tools','reader')).resolve()))
+	sys.path.append(str(Path(confs.get('Tools','normaliser')).resolve()))
+	try :
+		from Normaliser import orthonormalizatio as normalizator #the name can change according to your script
+	except ImportError :
+		normalizator = lambda x : x.lower()
+	try :
+		from Normaliser import orthonormalizationes as normalizatores #batch version, if available
+	except ImportError :
+		normalizatores = lambda xx : list(map(normalizator,xx))
+	from Resources import loadresources
+	from CoNLLUToolsmini import hashCoNLLU, selectCoNLLU, selectionfiles
+	risorse = loadresources(Path(confs.get('Data','derivation')).resolve(),normalizator,normalizatores,lang=confs.get('Parameters','lang'))
+	normo = Path(confs.get('Tools','normaliser')).resolve() / 'Normaliser.py'
+	impronta = hashCoNLLU(normo) if normo.exists() else '' #an index depends on the normaliser too
+	selezione = confs.get('Parameters','select',fallback='all')
+	if selectCoNLLU(selezione) is not None : #and on the selection of sentences, if any, with the content of its files
+		impronta = ' '.join([impronta,selezione.strip()] + [hashCoNLLU(f) for f in selectionfiles(selezione)])
+	return confs, normalizator, normalizatores, risorse, impronta
+#
+
+#Writes the index of nuclei of the treebank (see Nuclei)
+def indicizzare(configuratio) :
+	import time
+	confs, normalizator, normalizatores, risorse, impronta = preparare(configuratio)
+	from Nuclei import indexnuclei
+	from CoNLLUToolsmini import selectCoNLLU
+	conllu = Path(confs.get('Data','conllu')).resolve()
+	indice = Path('_'.join(('nuclei',confs.get('Parameters','lang'))) + '.sqlite')
+	inizio = time.perf_counter()
+	numerus = indexnuclei(conllu,indice,normalizator,normalizatores,fingerprint=impronta,intern=True,select=selectCoNLLU(confs.get('Parameters','select',fallback='all')))
+	print('Indexed {} syntactically annotated sentences of {} in {} ({:.1f} s).'.format(numerus,conllu,indice,time.perf_counter() - inizio))
+#
+
+#Extracts clausal free forms again from the index, once per definition (see Nuclei)
+def interrogare(configuratio,*definizioni) :
+	import json, time
+	confs, normalizator, normalizatores, risorse, impronta = preparare(configuratio)
+	from Nuclei import NucleusIndex, definitiones, definire, tabulafreeforms
+	from Columnar import formatum
+	ydioma = confs.get('Parameters','lang')
+	colonnare = formatum(confs.get('Parameters','columnar',fallback='none'))
+	indice = NucleusIndex('_'.join(('nuclei',ydioma)) + '.sqlite')
+	if not indice.current(Path(confs.get('Data','conllu')).resolve(),impronta) :
+		print('Beware: the treebank or the normaliser have changed since the index was written, run python Quid.py index {} again to update it.'.format(configuratio))
+	advpos = risorse.advpos
+	corrpos = {'PROPN': lambda x : 'NOUN', 'ADV' : lambda x : advpos.get(x,'ADV') , 'NUM' : lambda x : 'DET'} #see FreeForms.py
+	#
+	for d in definizioni or (None,) :
+		inizio = time.perf_counter()
+		specificatio = {}
+		if d is not None :
+			with open(d,'r',encoding='utf8') as intro :
+				specificatio = json.load(intro)
+		definitio = definire(definitiones(risorse.allbdeprel),specificatio)
+		syntagmata, sentnum, radnum = indice.freeforms(definitio,corrpos)
+		tabula = '_'.join(('freeforms',ydioma,Path(d).stem if d is not None else 'default'))
+		freeheadpos, _ = tabulafreeforms(syntagmata,tabula,colonnare)
+		print('{}: {} clausal free forms ({} consisting of a single form) headed by {} distinct lexemes, from {} roots not in a co-ordination in {} sentences ({:.1f} s).'.format(tabula + '.tsv',sum(v[0] for v in freeheadpos.values()),sum(v[1] for v in freeheadpos.values()),sum(v[2] for v in freeheadpos.values()),radnum,sentnum,time.perf_counter() - inizio))
+#
+
+#Draws the plots from the tables already written (see Plotting)
+def disegnare(configuratio,cartella='.') :
+	import configparser
+	confs = configparser.ConfigParser(delimiters='\t',comment_prefixes='#',inline_comment_prefixes='#')
+	confs.read(Path(configuratio))
+	sys.path.append(str(Path(confs.get('Tools','reader')).resolve()))
+	from Plotting import plotfreeforms
+	for imago in plotfreeforms(confs.get('Parameters','lang'),cartella) :
+		print('Written {}'.format(imago))
+#
+
+
+if __name__ == '__main__' :
+
+	if len(sys.argv) < 3 :
+		print('Usage: python Quid.py <task>[,<task>...] <configuration> (tasks: {}), python Quid.py plot <configuration> [directory], python Quid.py index <configuration> or python Quid.py query <configuration> [definition.json ...] or python Quid.py merge <configuration> <partial> [<partial> ...].'.format(', '.join(scripta)))
+		sys.exit(2)
+	#
+	opera = [o.strip() for o in sys.argv[1].split(',') if o.strip()]
+	if opera == ['plot'] :
+		disegnare(sys.argv[2],*sys.argv[3:4])
+	elif opera == ['index'] :
+		indicizzare(sys.argv[2])
+	elif opera == ['query'] :
+		interrogare(sys.argv[2],*sys.argv[3:])
+	elif opera == ['merge'] :
+		if not sys.argv[3:] :
+			print('Please specify the files of partial results to merge.')
+			sys.exit(2)
+		fondere(sys.argv[2],*sys.argv[3:])
+	elif all(o in scripta for o in opera) :
+		estrarre(opera,sys.argv[2])
+	else :
+		print('Unknown task(s): {} (tasks: {}, plot, index, query, merge).'.format(', '.join(o for o in opera if o not in scripta),', '.join(scripta)))
+		sys.exit(2)
+#
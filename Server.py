@@ -0,0 +1,241 @@
+#The following code has been developed by Flavio Massimiliano Cecchini as part of the work presented in "Quid verbumst? Applying a definition of word to Latin in Universal Dependencies", SyntaxFest 2025, Ljubljana. Please give credit to the author if you use any part of it.
+#Contact: flaviomassimiliano.cecchini at kuleuven.be
+
+#Server answering lookups about the status of lemmas and forms, as extracted by FreeForms.py and Affixes.py: whether they are attested as clausal free forms, as single-word sentences, as uninflected forms, and whether lexemes are underived
+#The tables written by the scripts (in the given directory, by default the current one) and the morphological resources are loaded once; the tables are read again as soon as they change. Queries are normalised and remapped to parts of speech as in the scripts
+#Usage: python Server.py <configuration> [address] [directory], where the address is either host:port for HTTP (by default 127.0.0.1:8765) or the path of a Unix socket
+#Requests (JSON):
+#	POST /lookup {"queries" : [{"lemma" : ..., "form" : ..., "upos" : ...}, ...]}, form and upos being optional -> {"results" : [...]} in the same order, a malformed query getting {"error" : ...} in its place
+#	GET /lookup?lemma=...&form=...&upos=... for a single query
+#	GET /status for the tables currently loaded
+#e.g. curl -s localhost:8765/lookup -d '{"queries" : [{"lemma" : "ecce", "upos" : "ADV"}]}' or curl -s --unix-socket quid.sock http://x/status
+
+#Useful imports
+import sys, os, stat, configparser, json, threading, time
+from pathlib import Path
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+from urllib.parse import urlsplit, parse_qs
+#
+
+#Inputs, specifications and data
+try :
+	configurationes = sys.argv[1]
+except (IndexError) :
+	print('Please specify the path to a file storing the configurations of the extraction whose results are to be served.')
+	quit()
+#
+confs = configparser.ConfigParser(delimiters='\t',comment_prefixes='#',inline_comment_prefixes='#')
+confs.read(Path(configurationes))
+#
+tools = Path(confs.get('Tools','reader')).resolve()
+sys.path.append(os.path.abspath(tools))
+from Resources import loadresources
+normo = Path(confs.get('Tools','normaliser')).resolve()
+sys.path.append(os.path.abspath(normo))
+try :
+	from Normaliser import orthonormalizatio #the name can change according to your script
+	normalizator = orthonormalizatio
+except ImportError :
+	normalizator = lambda x : x.lower()
+try :
+	from Normaliser import orthonormalizationes #batch version, if available
+	normalizatores = orthonormalizationes
+except ImportError :
+	normalizatores = lambda xx : list(map(normalizator,xx))
+#
+morphologia = Path(confs.get('Data','derivation')).resolve()
+ydioma = confs.get('Parameters','lang')
+#
+indirizzo = sys.argv[2] if len(sys.argv) > 2 else '127.0.0.1:8765'
+cartella = Path(sys.argv[3] if len(sys.argv) > 3 else '.').resolve()
+tabulae = {n : cartella / '_'.join((n,ydioma + '.tsv')) for n in ('singleforms','freeforms','aclitica','underived_lexemes')}
+intervallum = 1.0 #seconds between two checks of the tables
+#
+
+
+#Morphological resources, for the same remapping of parts of speech as in the scripts
+risorse = loadresources(morphologia,normalizator,normalizatores,lang=ydioma) #compiled only once, see Resources
+advpos = risorse.advpos
+corrpos = {'PROPN': lambda x : 'NOUN', 'ADV' : lambda x : advpos.get(x,'ADV') , 'NUM' : lambda x : 'DET'} #see FreeForms.py and Affixes.py
+#
+
+
+#Indexes rebuilt from the tables, in the shape of the structures built by the scripts: single forms and clausal free forms by part of speech and lemma, uninflected forms and underived lexemes by lemma and part of speech
+def caricare() :
+
+	singula = defaultdict(dict)
+	syntagmata = defaultdict(dict)
+	aclitica = {}
+	aderivata = set()
+
+	def righe(nome) :
+		if tabulae[nome].exists() :
+			with open(tabulae[nome],'r',encoding='utf8') as intro :
+				for riga in intro :
+					yield riga.rstrip('\n').split('\t')
+	#
+	for p,l,f,feats,sents,*_ in righe('singleforms') :
+		singula[(p,l)][f] = {'feats' : feats, 'sentences' : sents.split(',') if sents else []}
+	for p,l,n,lunghezza,_,sents,*_ in righe('freeforms') :
+		syntagmata[(p,l)][n] = {'length' : int(lunghezza), 'sentences' : sents.split(',') if sents else []}
+	for l,p,aformae,frequentia,feats,*resto in righe('aclitica') :
+		aclitica[(l,p)] = {'forms' : aformae.split(','), 'frequency' : int(frequentia), 'feats' : feats, 'inflected' : [f for f in resto[0].split(',') if f] if resto else []}
+	for l,p,*_ in righe('underived_lexemes') :
+		aderivata.add((l,p))
+
+	partes = defaultdict(set) #parts of speech of every lemma, for queries without one
+	for p,l in list(singula) + list(syntagmata) :
+		partes[l].add(p)
+	for l,p in list(aclitica) + list(aderivata) :
+		partes[l].add(p)
+
+	return {'singula' : singula, 'syntagmata' : syntagmata, 'aclitica' : aclitica, 'aderivata' : aderivata, 'partes' : partes}
+#
+
+#Identity of the tables (size and time of modification), to know when to rebuild the indexes
+def stato() :
+	return tuple((os.stat(t).st_size,os.stat(t).st_mtime_ns) if t.exists() else None for t in tabulae.values())
+#
+
+serratura = threading.Lock()
+indices = {'stato' : None, 'controllo' : 0.0, 'caricamento' : None, 'lettura' : False, 'singula' : {}, 'syntagmata' : {}, 'aclitica' : {}, 'aderivata' : set(), 'partes' : {}} #empty until the tables can be loaded
+
+#Current indexes, rebuilt if any table has changed since the last check. Tables are read outside the lock, so that queries keep being answered with the previous indexes meanwhile, and only one thread reads them at a time. A table which cannot be read (e.g. while a script is still writing it) leaves the previous indexes in place, and it is tried again at the next check
+def attuali() :
+	with serratura :
+		if time.monotonic() - indices['controllo'] < intervallum or indices['lettura'] :
+			return dict(indices)
+		indices['controllo'] = time.monotonic()
+		indices['lettura'] = True
+	try :
+		nuovo = stato()
+		if nuovo != indices['stato'] :
+			try :
+				caricati = caricare()
+				with serratura :
+					indices.update(caricati,stato=nuovo,caricamento=time.time())
+				print('Tables (re)loaded from {}'.format(cartella),flush=True)
+			except (ValueError,OSError) as e :
+				print('Tables of {} not loaded, still being written? ({})'.format(cartella,repr(e)),flush=True)
+	finally :
+		with serratura :
+			indices['lettura'] = False
+	with serratura :
+		return dict(indices) #a consistent set of indexes, even if they are replaced while answering
+#
+
+
+#Answer to a single query
+def rispondere(indici,domanda) :
+
+	ortholemma = normalizator(domanda['lemma'])
+	orthoforma = normalizator(domanda['form']) if domanda.get('form') else None
+	if domanda.get('upos') :
+		partes = [corrpos.get(domanda['upos'], lambda x : domanda['upos'])(ortholemma)]
+	else : #any part of speech
+		partes = sorted(indici['partes'].get(ortholemma,()))
+	#
+	risposta = {'lemma' : ortholemma, 'form' : orthoforma, 'pos' : {}}
+	for p in partes :
+		singulae = indici['singula'].get((p,ortholemma),{})
+		typi = indici['syntagmata'].get((p,ortholemma),{})
+		aclitum = indici['aclitica'].get((ortholemma,p))
+		risposta['pos'][p] = {'freeform' : orthoforma in typi if orthoforma else bool(typi),\
+							  'freeform_types' : sorted(typi),\
+							  'singleform' : orthoforma in singulae if orthoforma else bool(singulae),\
+							  'singleform_sentences' : singulae[orthoforma]['sentences'] if orthoforma in singulae else sorted({s for v in singulae.values() for s in v['sentences']}),\
+							  'uninflected' : (orthoforma in aclitum['forms'] if orthoforma else True) if aclitum else False,\
+							  'uninflected_forms' : aclitum['forms'] if aclitum else [],\
+							  'underived' : (ortholemma,p) in indici['aderivata'],\
+							 }
+
+	return risposta
+#
+
+#Answer to a query of a batch: a malformed one gets an error in its place, without affecting the others
+def vagliare(indici,domanda) :
+	if not isinstance(domanda,dict) or not isinstance(domanda.get('lemma'),str) :
+		return {'error' : 'a query needs a lemma: {"lemma" : ..., "form" : ..., "upos" : ...}'}
+	if any(domanda.get(k) is not None and not isinstance(domanda[k],str) for k in ('form','upos')) :
+		return {'error' : 'form and upos have to be strings'}
+	try :
+		return rispondere(indici,domanda)
+	except (ValueError,KeyError,TypeError,AttributeError) as e :
+		return {'error' : 'malformed query ({})'.format(repr(e))}
+#
+
+#HTTP requests, over TCP or a Unix socket
+class Gestore(BaseHTTPRequestHandler) :
+
+	def inviare(self,codice,contenuto) :
+		corpo = json.dumps(contenuto,ensure_ascii=False).encode('utf8')
+		self.send_response(codice)
+		self.send_header('Content-Type','application/json; charset=utf-8')
+		self.send_header('Content-Length',str(len(corpo)))
+		self.end_headers()
+		self.wfile.write(corpo)
+
+	def do_GET(self) :
+		percorso = urlsplit(self.path)
+		indici = attuali()
+		if percorso.path == '/status' :
+			self.inviare(200,{'lang' : ydioma, 'directory' : str(cartella), 'loaded' : indici['caricamento'], 'tables' : {n : t.exists() for n,t in tabulae.items()}, 'entries' : {n : len(indici[n]) for n in ('singula','syntagmata','aclitica','aderivata')}})
+		elif percorso.path == '/lookup' :
+			domanda = {k : v[0] for k,v in parse_qs(percorso.query).items()}
+			if 'lemma' not in domanda :
+				self.inviare(400,{'error' : 'a lemma is needed'})
+			else :
+				self.inviare(200,rispondere(indici,domanda))
+		else :
+			self.inviare(404,{'error' : 'unknown path, use /lookup or /status'})
+
+	def do_POST(self) :
+		if urlsplit(self.path).path != '/lookup' :
+			self.inviare(404,{'error' : 'unknown path, use /lookup'})
+			return
+		try :
+			domande = json.loads(self.rfile.read(int(self.headers.get('Content-Length',0))) or b'{}')['queries']
+			if not isinstance(domande,list) :
+				raise TypeError('queries is not a list')
+		except (ValueError,KeyError,TypeError,AttributeError) as e :
+			self.inviare(400,{'error' : 'malformed request ({}): {{"queries" : [{{"lemma" : ..., "form" : ..., "upos" : ...}}, ...]}} expected'.format(repr(e))})
+			return
+		indici = attuali()
+		self.inviare(200,{'results' : [vagliare(indici,d) for d in domande]})
+
+	def address_string(self) : #no address for Unix sockets
+		return self.client_address[0] if self.client_address else 'local'
+
+	def log_message(self,formato,*args) :
+		pass
+#
+
+class ServerUnix(ThreadingMixIn,UnixStreamServer) :
+	daemon_threads = True
+#
+
+
+if __name__ == '__main__' :
+	if ':' in indirizzo and not os.sep in indirizzo :
+		ospite, porta = indirizzo.rsplit(':',1)
+		server = ThreadingHTTPServer((ospite,int(porta)),Gestore)
+	else :
+		if os.path.exists(indirizzo) : #only an old socket is removed, never a file given by mistake
+			if not stat.S_ISSOCK(os.stat(indirizzo).st_mode) :
+				print('{} exists and is not a socket, please specify another address.'.format(indirizzo))
+				quit()
+			os.unlink(indirizzo)
+		server = ServerUnix(indirizzo,Gestore)
+	attuali()
+	print('Serving {} ({}) on {}'.format(cartella,ydioma,indirizzo),flush=True)
+	try :
+		server.serve_forever()
+	except KeyboardInterrupt :
+		pass
+	finally :
+		server.server_close()
+		if isinstance(server,ServerUnix) :
+			os.unlink(indirizzo)
+#
@@ -1,6 +1,7 @@
 #The following code has been developed by Flavio Massimiliano Cecchini between 2018 and 2025. It is part of a package that will hopefully be officially released at some point. Please give credit to the author if you use any part of it. 
 #Contact: flaviomassimiliano.cecchini at kuleuven.be
 
+import io
 from collections import namedtuple
 
 ##Recurrent structures
@@ -9,6 +10,122 @@ from collections import namedtuple
 CoNLLURow = namedtuple('CoNLLURow', 'id form lemma upos xpos feats head deprel deps misc') 
 CoNLLURow.__new__.__defaults__ = ('_',)*len(CoNLLURow._fields) 
 
+#Compact alternative to a Networkx directed graph for a syntactic tree (see readCoNLLU with compact=True). Rows are kept as records indexed by node, together with precomputed lists of dependents; the linear order of syntactic words and the ranges of multiword tokens are computed only once, at first request. It offers the same accessors used in this package: iteration over nodes, tree[node] and successors for dependents, conllunode and syntacticwords
+class CoNLLUTree :
+	
+	__slots__ = ('features','children','_edges','_words','_ranges')
+	
+	def __init__(self) :
+		self.features = {} #node -> row
+		self.children = {} #node -> list of dependent nodes, in order of reading
+		self._edges = 0
+		self._words = None
+		self._ranges = None
+	
+	def add_node(self,node,features=None) :
+		self.features[node] = features
+		self.children.setdefault(node,[])
+		self._words = self._ranges = None
+	
+	def add_edge(self,head,dependent) :
+		self.children.setdefault(head,[]).append(dependent)
+		self.children.setdefault(dependent,[])
+		self._edges += 1
+	
+	def successors(self,node) :
+		return iter(self.children[node])
+	
+	def number_of_edges(self) :
+		return self._edges
+	
+	def edges(self) :
+		return ((h,d) for h,dd in self.children.items() for d in dd)
+	
+	def __getitem__(self,node) :
+		return self.children[node]
+	
+	def __iter__(self) :
+		return iter(self.features)
+	
+	def __len__(self) :
+		return len(self.features)
+	
+	def __contains__(self,node) :
+		return node in self.features
+	
+	#Syntactic words in linear order
+	def words(self) :
+		if self._words is None :
+			self._words = [self.features[n] for n in sorted(self.features) if n[0] > 0 and n[1] == 0]
+		return self._words
+	
+	#Multiword tokens as a dictionary from their node to the (first,last) couple of indices of the words they span
+	def ranges(self) :
+		if self._ranges is None :
+			self._ranges = {n : (n[0],n[0]-n[1]) for n in sorted(self.features) if n[1] < 0}
+		return self._ranges
+#
+
+#Immutable dictionary of features, as produced by internUDfeatures: every distinct feats-like string is parsed only once into a bundle shared by all of its occurrences. A bundle is identified by a stable integer (its order of first appearance), and its serialisation is computed only once (see writeUDfeatures). To modify it, it has to be copied into a regular dictionary first (e.g. with dict() or |)
+class UDFeatures(dict) :
+	
+	__slots__ = ('id','source','string')
+	
+	def immutable(self,*args,**kwargs) :
+		raise TypeError('Interned features cannot be modified, copy them into a dictionary first.')
+	__setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __ior__ = immutable
+	
+	def __reduce__(self) : #a bundle is rebuilt (and re-interned) from its original string
+		return (internUDfeatures,(self.source,))
+#
+
+#Regular (mutable) dictionary of features keeping its original string, as decoded from a LazyFeatures (see below)
+class DecodedFeatures(dict) :
+
+	__slots__ = ('source',)
+#
+
+#Lazy decoding of feats-like strings (see readCoNLLU with lazy=True): a dictionary of features is created empty with its string, and filled only at its first access, when it also turns into its eager class. From then on it is a regular dictionary of that class, at no further cost. Only functions reading the storage of dictionaries directly (e.g. json) would see it empty before that
+class LazyDecoding :
+
+	__slots__ = ()
+
+	def decode(self) :
+		dict.update(self,readUDfeatures(self.source))
+		self.__class__ = self.eager
+		return self
+
+	def __reduce_ex__(self,protocol) : #pickled as its eager class
+		return self.decode().__reduce_ex__(protocol)
+
+for metodo in ('__getitem__','__contains__','__iter__','__reversed__','__len__','__eq__','__ne__','__or__','__ror__','__ior__','__repr__','get','keys','values','items','copy','__setitem__','__delitem__','update','pop','popitem','setdefault','clear') :
+	setattr(LazyDecoding,metodo,(lambda metodo : lambda self,*args,**kwargs : getattr(self.decode(),metodo)(*args,**kwargs))(metodo))
+#
+
+#Lazy counterpart of DecodedFeatures, for rows read with lazy=True
+class LazyFeatures(LazyDecoding,DecodedFeatures) :
+
+	__slots__ = ()
+	eager = DecodedFeatures
+
+	def __init__(self,source) :
+		self.source = source
+#
+
+#Lazy counterpart of UDFeatures, for bundles interned with lazy=True (see internUDfeatures): a bundle is decoded once, at the first access from any of its occurrences
+class LazyUDFeatures(LazyDecoding,UDFeatures) :
+
+	__slots__ = ()
+	eager = UDFeatures
+#
+
+#Structure of a nucleus, i.e. a subtree extracted according to some criteria (see extractnucleus), combining and counting its forms/lemmas/POS/relations/features
+Nucleus = namedtuple('Nucleus', 'ids forms lemmas upos feats deprels') 
+
+#Structure of a consumer of a single reading pass over a CoNLL-U file (see traverseCoNLLU): a method taking a sentence's metadata and its tree, and whether it requires syntactic annotation
+Consumer = namedtuple('Consumer', 'function syntax')
+Consumer.__new__.__defaults__ = (False,)
+
 #Classification of parts of speech according to different dimensions (auto = autosemantic, syn = synsemantic, main = representing of one of the three main phrase units, mod = modifier [adjectives], clit = clitic, meta = metapredicating, pred = predicating [verbs], ref = referent [nouns], alex = not a lexical element)
 UDPos = {'ADJ':('auto','main','mod'),\
 		 'ADP':('syn','clit'),\
@@ -36,13 +153,36 @@ UDPos = {'ADJ':('auto','main','mod'),\
 #Generator of trees represented as directed graphs by means of Networkx; features are stored as named tuples under 'features'. The index of a node can be any positive real number, expressed with a given decimal separator (decsep), which has to be different from the dot or the hyphen. Only order is relevant, indices will be recreated when printing the tree (see method).
 #Every node is identified by a couple of real numbers: a positive index (zero only for the formal root) and a negative range for multiword tokens, zero otherwise.
 #Also an empty tree, i.e. with no syntax, can be read
+#With compact=True, trees are built as the lighter CoNLLUTree (see above) instead of Networkx graphs
+#With a span, i.e. a couple of byte offsets (see shardCoNLLU), only that part of the file is read
+#With cache=True, the whole file is read through a binary cache stored next to it (see cacheCoNLLU)
+#With intern=True, feats are immutable bundles shared by all identical strings (see UDFeatures); misc, whose strings are often unique to a token (e.g. identifiers), is decoded as without it, so that the table of bundles stays as small as the set of feature combinations
+#With rows, an iterable of rows of the file (e.g. some of its sentences, see fetchCoNLLU), only these are read; the file itself is still needed for the declaration of columns in CoNLL-U Plus
+#With fields, a collection of names of columns (in lower case), only these are read, the others keeping their default value: the id is always read, and so is the head when syntax is required
+#With lazy=True, feats and misc are decoded only at their first access (see LazyDecoding), also when interned
+#Neither fields nor lazy have any effect through the cache, which always keeps whole rows, so as to be shared by all readings
+#With select, a predicate on the metadata of a sentence (a dictionary of its comments, e.g. built with selectCoNLLU), only the sentences satisfying it are yielded. It is checked as soon as the comments are over, so that the rows of the other sentences are just skipped; likewise, with syntax=True, rows are only parsed once one of them is found to have a head. Through the cache, the predicate is checked on the sentences read from it
 #Enhanced dependencies are not yet implemented
-def readCoNLLU(conllu,comments='#',sents='sent_id',encoding='utf8', decsep=',',syntax=True,plus=False) : 
+def readCoNLLU(conllu,comments='#',sents='sent_id',encoding='utf8', decsep=',',syntax=True,plus=False,compact=False,span=None,cache=False,intern=False,rows=None,fields=None,lazy=False,select=None) : 
 	
 	from collections import namedtuple
-	import regex, networkx
-	from networkx.algorithms.cycles import simple_cycles
-	from networkx.classes.function import is_empty
+	from contextlib import closing
+	import regex
+	
+	if cache and span is None and rows is None :
+		for sentence, tree in cacheCoNLLU(conllu,comments=comments,sents=sents,encoding=encoding,decsep=decsep,syntax=syntax,plus=plus,compact=compact,intern=intern) :
+			if select is None or select(sentence) :
+				yield sentence, tree
+		return
+	
+	if fields is not None :
+		fields = set(fields) | {'id'} | ({'head'} if syntax else set())
+	
+	if compact :
+		Arbor = CoNLLUTree
+	else :
+		import networkx
+		Arbor = networkx.DiGraph
 	
 	if decsep in ('-','.') : #not admitted, already used for ranges and extra nodes in enhanced annotation
 		raise Exception('Careful! The decimal separator must differ from . or -.')
@@ -52,22 +192,98 @@ def readCoNLLU(conllu,comments='#',sents='sent_id',encoding='utf8', decsep=',',s
 	
 	sentence = {}
 
-	with open(conllu,'r',encoding=encoding) as document :
+	with closing(linesCoNLLU(conllu,encoding=encoding,span=span) if rows is None else (r for r in rows)) as document :
 		
 		#Definition of fields and rows
-		fields = ('id', 'form', 'lemma', 'upos', 'xpos', 'feats', 'head', 'deprel', 'deps', 'misc')
+		udfields = ('id', 'form', 'lemma', 'upos', 'xpos', 'feats', 'head', 'deprel', 'deps', 'misc')
 		plusfields = ()
 		if plus :
-			plusfields = tuple(map(lambda x : x.replace(':','_'),document.readline()[len('# global.columns = '):].strip(' \n').split(' ')))
+			if (span and span[0] > 0) or rows is not None : #the declaration of columns only stands at the beginning of the file
+				with closing(linesCoNLLU(conllu,encoding=encoding)) as testa :
+					intestatio = next(testa)
+			else :
+				intestatio = next(document)
+			plusfields = tuple(map(lambda x : x.replace(':','_'),intestatio[len('# global.columns = '):].strip(' \n\r').split(' ')))
 		else :
-			plusfields = tuple(fields)
+			plusfields = tuple(udfields)
 		#
 		nfields = len(plusfields)
 		CoNLLURow = 	namedtuple('CoNLLURow', ' '.join(map(str.lower,plusfields)))
-		CoNLLURow.__new__.__defaults__ = tuple(('_' if c in fields else '*') for c in plusfields)  
+		CoNLLURow.__new__.__defaults__ = tuple(('_' if c in udfields else '*') for c in plusfields)  
+		#
+		#Positions of the columns to be treated: those not read (which keep their default value), those to be decoded as feats-like strings (plus files do not necessarily have feats nor misc), the id and the head
+		omissa = [i for i,c in enumerate(CoNLLURow._fields) if fields is not None and c not in fields]
+		decodenda = [(i,c) for i,c in enumerate(plusfields) if c in ('feats','misc') and i not in omissa]
+		iid = CoNLLURow._fields.index('id')
+		ihead = CoNLLURow._fields.index('head') if 'head' in CoNLLURow._fields and CoNLLURow._fields.index('head') not in omissa else None
+		if lazy :
+			decode = {'feats' : (lambda x : internUDfeatures(x,lazy=True)) if intern else LazyFeatures, 'misc' : LazyFeatures}
+		else :
+			decode = {'feats' : internUDfeatures if intern else readUDfeatures, 'misc' : readUDfeatures}
+		#
+		
+		#Tree of the rows of a sentence, with the artificial root if the sentence has an identifier
+		def arbor(righe,radix) :
+			
+			tree = Arbor() #syntactic tree: rooted, oriented tree with linear order on the nodes
+			if radix :
+				tree.add_node((0,0), features = CoNLLURow(id=(0,0))) #artificial node root from which the tree descends
+			
+			for row in righe :
+				
+				values = row.split('\t')[:nfields]
+				
+				for i in omissa : 
+					if i < len(values) :
+						values[i] = CoNLLURow.__new__.__defaults__[i]
+				for i,c in decodenda : 
+					if i < len(values) :
+						values[i] = decode[c](values[i]) #We need to convert feats-like strings into dictionaries, and viceversa
+				#
+			
+				identifier = values[iid]
+				if identifier.isdecimal() : #a plain syntactic word, by far the commonest case
+					index = (float(identifier),0)
+				else :
+					index = list(map(lambda  x : float(x.replace(decsep,'.')),regex.split(separators,identifier))) #the dot is needed by Python floats
+					index += [0]*(2-len(index)) #ordering always works on couples; zero is the default value for regular words
+					if regex.fullmatch(interval,identifier) : #treatment of multiword tokens
+						index[1] = index[0] - index[1] #the span of the range is given by a negative number
+					index = tuple(index)
+				values[iid] = index
+				
+				head = None
+				if ihead is not None and ihead < len(values) :
+					try : 
+						head = int(values[ihead]) #we prefer an integer instead of a string
+						values[ihead] = (head,0)
+					except (ValueError) : #when there is no syntax, e.g. for multiword tokens
+						pass 
+				
+				tree.add_node((int(index[0]),int(index[1])), features=CoNLLURow._make(values)) #option for headless nodes, e.g. multiword tokens
+				if head is not None :
+					tree.add_edge((head,0),index) 
+			
+			return tree
 		#
 		
-		tree = networkx.DiGraph() 
+		#Whether a row has a head, i.e. whether it gives an edge once parsed, looking only at its column
+		def capitata(row) :
+			if ihead is None :
+				return False
+			values = row.split('\t',ihead + 1)
+			if len(values) <= ihead :
+				return False
+			try :
+				int(values[ihead])
+				return True
+			except (ValueError) :
+				return False
+		#
+		
+		righe = [] #rows of the current sentence, only parsed when it is yielded
+		radix = False
+		exclusa = None #whether the current sentence does not satisfy select, once its comments are over
 		
 		for row in document :
 			
@@ -79,41 +295,498 @@ def readCoNLLU(conllu,comments='#',sents='sent_id',encoding='utf8', decsep=',',s
 				sentence[comm.strip()] = value.strip()
 				
 				if comm.strip() == sents :
-					tree = networkx.DiGraph() #syntactic tree: rooted, oriented tree with linear order on the nodes
-					tree.add_node((0,0), features = CoNLLURow(id=(0,0))) #artificial node root from which the tree descends
+					righe = []
+					radix = True
+					exclusa = None
 			#	
 			elif row.startswith(('1','2','3','4','5','6','7','8','9')) : #token of any kind #this is the most specific condition possible, made explicit
-
-				node = CoNLLURow._make(row.split('\t')[:nfields])
 				
-				for f in {'feats','misc'}.intersection(plusfields) : #Plus files do not necessarily have feats nor misc
-					node = node._replace(**{f : readUDfeatures(getattr(node,f))}) #We need to convert feats-like strings into dictionaries, and viceversa
-				#
-			
-				index = list(map(lambda  x : float(x.replace(decsep,'.')),regex.split(separators,node.id))) #the dot is needed by Python floats
-				index += [0]*(2-len(index)) #ordering always works on couples; zero is the default value for regular words
-				if regex.fullmatch(interval,node.id) : #treatment of multiword tokens
-					index[1] = index[0] - index[1] #the span of the range is given by a negative number
-				node = node._replace(id=tuple(index))
-				
-				try : 
-					node = node._replace(head=int(node.head)) #we prefer an integer instead of a string
-				except (ValueError) : #when there is no syntax
-					pass 
-				
-				tree.add_node(tuple(map(int,node.id)), features=node._replace(head=(node.head,0) if isinstance(node.head,int) else node.head)) #option for headless nodes, e.g. multiword tokens
-				if isinstance(node.head,int) :
-					tree.add_edge((node.head,0),node.id) 
+				if exclusa is None :
+					exclusa = select is not None and not select(sentence)
+				if not exclusa :
+					righe.append(row)
 			#
-			elif not is_empty(tree) or (not syntax and tree.nodes()) : 
-				yield sentence, tree
-				tree = networkx.DiGraph() #we re-initialise the syntactic tree
+			elif exclusa : #the rows of a sentence not selected have been skipped
+				righe = []
+				radix = False
+				sentence = {}
+				exclusa = None
+			elif any(map(capitata,righe)) or (not syntax and (radix or righe)) : 
+				yield sentence, arbor(righe,radix)
+				righe = [] #we re-initialise the syntactic tree
+				radix = False
 				sentence = {}
+				exclusa = None
 			#
 			
 		#to print the final tree	
-		if not is_empty(tree) or (not syntax and tree.nodes()) :
-			yield sentence, tree
+		if not exclusa and (any(map(capitata,righe)) or (not syntax and (radix or righe))) :
+			yield sentence, arbor(righe,radix)
+#
+
+#Predicate on the metadata of a sentence, to be passed to readCoNLLU (select), true when all the conditions hold. Conditions are a dictionary from the names of comments (sent_id, newdoc id, or any other "# key = value") to what their value has to be: a string (the value itself), a compiled regular expression (found in the value), a collection of strings (e.g. a list of identifiers) or a function of the value. A sentence lacking a comment does not satisfy the conditions on it
+#Conditions can also be written as a string, e.g. in a configuration, separated by semicolons: key=value, key~regular expression, key@file (a file with one value per row). It returns None (no selection) for an empty string, all or none
+def selectCoNLLU(conditions) :
+
+	import regex
+
+	if isinstance(conditions,str) :
+		testo = conditions
+		conditions = {}
+		if testo.strip().lower() in ('','all','none') :
+			return None
+		for chiave, operatore, valore in parseselection(testo) :
+			if operatore == '=' :
+				conditions[chiave] = valore
+			elif operatore == '~' :
+				conditions[chiave] = regex.compile(valore)
+			else :
+				with open(valore,'r',encoding='utf8') as intro :
+					conditions[chiave] = frozenset(filter(None,(r.strip() for r in intro)))
+	#
+	tests = []
+	for chiave, valore in conditions.items() :
+		if isinstance(valore,str) :
+			tests.append((chiave,valore.__eq__))
+		elif hasattr(valore,'search') :
+			tests.append((chiave,lambda x, valore=valore : valore.search(x) is not None))
+		elif callable(valore) :
+			tests.append((chiave,valore))
+		else :
+			tests.append((chiave,frozenset(valore).__contains__))
+
+	return lambda sentence : all(chiave in sentence and test(sentence[chiave]) for chiave,test in tests)
+#
+
+#Conditions of a selection written as a string (see above), as triples of key, operator and value
+def parseselection(conditions) :
+	
+	for c in conditions.split(';') :
+		c = c.strip()
+		if not c or c.lower() in ('all','none') :
+			continue
+		posizione = min([c.index(o) for o in '=~@' if o in c],default=-1)
+		if posizione < 1 :
+			raise ValueError('Unknown selection of sentences: {} (key=value, key~regular expression or key@file).'.format(c))
+		yield c[:posizione].strip(), c[posizione], c[posizione + 1:].strip()
+#
+
+#Files read by a selection written as a string (key@file), whose contents are part of it (e.g. for the fingerprint of an incremental run)
+def selectionfiles(conditions) :
+	return [valore for _, operatore, valore in parseselection(conditions) if operatore == '@']
+#
+
+#Compression formats of CoNLL-U files, recognised by their first bytes (whatever the extension)
+compressions = {'gz' : b'\x1f\x8b', 'xz' : b'\xfd7zXZ\x00', 'bz2' : b'BZh', 'zst' : b'\x28\xb5\x2f\xfd'}
+
+#Compression of a file, None if it is plain text
+def compressionCoNLLU(conllu) :
+	
+	with open(conllu,'rb') as document :
+		magic = document.read(6)
+	
+	for c,m in compressions.items() :
+		if magic.startswith(m) :
+			return c
+#
+
+#Binary stream of the decompressed content of a file, decompressed by chunks in a background thread while the reader consumes them (decompressors release the GIL, so both proceed at the same time). Only a few chunks are kept in memory, nothing is written on disk
+#It can be wrapped like any raw stream (see openCoNLLU); closing it stops the thread
+class DecompressedStream(io.RawIOBase) :
+	
+	def __init__(self,conllu,compression,chunk=1<<20,buffers=8) :
+		
+		import threading, queue
+		
+		self.queue = queue.Queue(buffers)
+		self.stop = threading.Event()
+		self.current = memoryview(b'')
+		self.finished = False
+		self.thread = threading.Thread(target=self.decompress,args=(conllu,compression,chunk),daemon=True)
+		self.thread.start()
+	
+	def decompress(self,conllu,compression,chunk) :
+		try :
+			if compression == 'zst' :
+				try :
+					from compression import zstd #Python 3.14 onwards
+					source = zstd.open(conllu,'rb')
+				except ImportError :
+					import zstandard
+					source = zstandard.ZstdDecompressor().stream_reader(open(conllu,'rb'),closefd=True)
+			else :
+				import gzip, lzma, bz2
+				source = {'gz' : gzip, 'xz' : lzma, 'bz2' : bz2}[compression].open(conllu,'rb')
+			with source :
+				for block in iter(lambda : source.read(chunk),b'') :
+					if self.stop.is_set() :
+						return
+					self.queue.put(block)
+			self.queue.put(None)
+		except BaseException as e : #passed on to the reader
+			self.queue.put(e)
+	
+	def readable(self) :
+		return True
+	
+	def readinto(self,buffer) :
+		while not len(self.current) :
+			if self.finished :
+				return 0
+			block = self.queue.get()
+			if block is None :
+				self.finished = True
+				return 0
+			if isinstance(block,BaseException) :
+				self.finished = True
+				raise block
+			self.current = memoryview(block)
+		n = min(len(buffer),len(self.current))
+		buffer[:n] = self.current[:n]
+		self.current = self.current[n:]
+		return n
+	
+	def close(self) :
+		if not self.closed :
+			self.stop.set()
+			while self.thread.is_alive() : #the thread might be waiting for room in the queue
+				try :
+					self.queue.get(timeout=0.1)
+				except Exception :
+					pass
+		super().close()
+#
+
+#Opens a CoNLL-U file, plain or compressed (see compressions), in binary ('rb') or text mode ('r')
+def openCoNLLU(conllu,mode='r',encoding='utf8') :
+	
+	compression = compressionCoNLLU(conllu)
+	if compression is None :
+		return open(conllu,mode,encoding=None if 'b' in mode else encoding)
+	
+	document = io.BufferedReader(DecompressedStream(conllu,compression),buffer_size=1<<16)
+	return document if 'b' in mode else io.TextIOWrapper(document,encoding=encoding)
+#
+
+#Generator of the rows of a CoNLL-U file, possibly restricted to a span of byte offsets (start,end). Compressed files are decompressed on the fly (see openCoNLLU); their spans refer to the decompressed content, which is read up to the beginning of the span
+def linesCoNLLU(conllu,encoding='utf8',span=None) :
+	
+	if span is None :
+		with openCoNLLU(conllu,'r',encoding=encoding) as document :
+			yield from document
+	else :
+		start, end = span
+		with openCoNLLU(conllu,'rb') as document :
+			if document.seekable() :
+				document.seek(start)
+			else :
+				skip = start
+				while skip > 0 :
+					skipped = len(document.read(min(skip,1<<20)))
+					if not skipped :
+						break
+					skip -= skipped
+			while start < end :
+				row = document.readline()
+				if not row :
+					break
+				start += len(row)
+				yield row.decode(encoding)
+#
+
+#Splits a CoNLL-U file in (at most) a given number of spans of byte offsets of similar size, all aligned on the blank lines separating sentences, so that each of them can be read independently (see readCoNLLU)
+#Spans of compressed files refer to their decompressed content, whose sentence boundaries are all found in a single pass
+def shardCoNLLU(conllu,shards) :
+	
+	import os, bisect
+	
+	if compressionCoNLLU(conllu) is not None :
+		ends = [end for _,(start,end) in blocksCoNLLU(conllu)]
+		size = ends[-1] if ends else 0
+		limits = [0]
+		for i in range(1,shards) :
+			position = ends[bisect.bisect_left(ends,size*i//shards)] if size else 0
+			if limits[-1] < position < size :
+				limits.append(position)
+		limits.append(size)
+		return list(zip(limits[:-1],limits[1:]))
+	#
+	
+	size = os.path.getsize(conllu)
+	limits = [0]
+	
+	with open(conllu,'rb') as document :
+		for i in range(1,shards) :
+			position = max(size*i//shards,limits[-1])
+			document.seek(position)
+			if position > 0 :
+				position += len(document.readline()) #we move to the beginning of the next full row
+			for row in iter(document.readline,b'') :
+				position += len(row)
+				if not row.strip() : #end of a sentence
+					break
+			if limits[-1] < position < size :
+				limits.append(position)
+	#
+	limits.append(size)
+	
+	return list(zip(limits[:-1],limits[1:]))
+#
+
+#Generator of the sentences of a CoNLL-U file as spans of byte offsets (start,end), each with its identifier (None if absent), without parsing them. With text=True, the bytes of every sentence are yielded as well, as a third element
+#Compressed files are decompressed on the fly (see openCoNLLU), their offsets referring to the decompressed content
+def blocksCoNLLU(conllu,comments='#',sents='sent_id',encoding='utf8',text=False) :
+	
+	comments = comments.encode(encoding)
+	identifier = None
+	start = position = None
+	rows = []
+	
+	with openCoNLLU(conllu,'rb') as document :
+		position = 0
+		for row in document :
+			riga = row.strip()
+			if riga :
+				if start is None :
+					start = position
+				if identifier is None and riga.startswith(comments) :
+					comm, _, value = riga[len(comments):].partition(b'=')
+					if comm.strip().decode(encoding) == sents :
+						identifier = value.strip().decode(encoding)
+			elif start is not None : #end of a sentence
+				if text :
+					rows.append(row)
+					yield identifier, (start,position + len(row)), b''.join(rows)
+					rows = []
+				else :
+					yield identifier, (start,position + len(row))
+				identifier = start = None
+			if text and start is not None :
+				rows.append(row)
+			position += len(row)
+		#
+		if start is not None :
+			yield (identifier, (start,position), b''.join(rows)) if text else (identifier, (start,position))
+#
+
+#Index of the sentences of a CoNLL-U file by their identifier, as spans of byte offsets (see blocksCoNLLU). The index is stored in a sidecar file next to the CoNLL-U one and rebuilt only when the latter changes (according to its size and time of modification). If an identifier appears more than once, only its first occurrence is indexed
+def indexCoNLLU(conllu,comments='#',sents='sent_id',encoding='utf8') :
+	
+	import os
+	
+	status = os.stat(conllu)
+	signature = '# size = {}\n# mtime = {}\n'.format(status.st_size,status.st_mtime_ns)
+	sidecar = str(conllu) + '.index'
+	index = {}
+	
+	if os.path.exists(sidecar) :
+		with open(sidecar,'r',encoding='utf8') as intro :
+			if intro.readline() + intro.readline() == signature :
+				for riga in intro :
+					i,start,end = riga.rstrip('\n').split('\t')
+					index[i] = (int(start),int(end))
+				return index
+	#
+	
+	for i,span in blocksCoNLLU(conllu,comments=comments,sents=sents,encoding=encoding) :
+		if i is not None :
+			index.setdefault(i,span)
+	#
+	with open(sidecar,'w',encoding='utf8') as exo :
+		exo.write(signature)
+		for i,(start,end) in index.items() :
+			exo.write('{}\t{}\t{}\n'.format(i,start,end))
+	
+	return index
+#
+
+#Random access to sentences by identifier, one or many (in the given order), through the index of the file (see indexCoNLLU), which is memory-mapped so that only the requested sentences are read and parsed. Identifiers absent from the file are skipped
+#It yields the same as readCoNLLU, with whose parameters it can be called (by default, sentences without syntax are returned too), or the text of each sentence with raw=True
+def fetchCoNLLU(conllu,sentids,raw=False,**kwargs) :
+	
+	import mmap, os
+	
+	if isinstance(sentids,str) :
+		sentids = (sentids,)
+	kwargs.setdefault('syntax',False)
+	encoding = kwargs.get('encoding','utf8')
+	
+	index = indexCoNLLU(conllu,comments=kwargs.get('comments','#'),sents=kwargs.get('sents','sent_id'),encoding=encoding)
+	if not os.path.getsize(conllu) : #an empty file cannot be mapped
+		return
+	
+	if compressionCoNLLU(conllu) is not None : #no random access: the requested sentences are collected in a single pass over the decompressed content
+		sentids = [i for i in sentids if i in index]
+		wanted = {index[i] for i in sentids}
+		found = {span : t for _,span,t in blocksCoNLLU(conllu,comments=kwargs.get('comments','#'),sents=kwargs.get('sents','sent_id'),encoding=encoding,text=True) if span in wanted}
+		texts = (found[index[i]].decode(encoding) for i in sentids)
+		if raw :
+			yield from texts
+		else :
+			yield from readCoNLLU(conllu,rows=(r for t in texts for r in t.splitlines() + [''] ),**kwargs)
+		return
+	
+	with open(conllu,'rb') as document, mmap.mmap(document.fileno(),0,access=mmap.ACCESS_READ) as mappa :
+		texts = (mappa[index[i][0]:index[i][1]].decode(encoding) for i in sentids if i in index)
+		if raw :
+			yield from texts
+		else : #all sentences go through the same reading, each closed by a blank row
+			yield from readCoNLLU(conllu,rows=(r for t in texts for r in t.splitlines() + [''] ),**kwargs)
+#
+
+#Hash of the content of a file, read by chunks
+def hashCoNLLU(conllu,chunk=1<<20) :
+	
+	import hashlib
+	
+	digest = hashlib.blake2b(digest_size=16)
+	with open(conllu,'rb') as document :
+		for block in iter(lambda : document.read(chunk),b'') :
+			digest.update(block)
+	
+	return digest.hexdigest()
+#
+
+#Same as readCoNLLU (with the same parameters), but through a binary cache stored next to the CoNLL-U file, which is written at the first complete reading. The cache is identified by the hash of the file's content and by the reading options, so that it is automatically ignored whenever either of them changes; caches of a previous content of the file are deleted once a new one is written, while those of other reading options are kept
+#The cache is a stream of pickled sentences in which every distinct value (forms, lemmas, relations, indices, feature dictionaries...) is stored only once and then referred to by an integer, so that nothing has to be split, converted or parsed again
+def cacheCoNLLU(conllu,compact=False,version=2,**kwargs) :
+	
+	import pickle, os, hashlib, regex
+	from pathlib import Path
+	from collections import namedtuple
+	
+	conllu = Path(conllu)
+	options = sorted(kwargs.items()) #all those options of readCoNLLU which affect what is read
+	contentum = hashlib.blake2b(repr((version,hashCoNLLU(conllu))).encode(),digest_size=8).hexdigest()
+	clavis = hashlib.blake2b(repr(options).encode(),digest_size=8).hexdigest()
+	cache = conllu.with_name('{}.{}.{}.cache'.format(conllu.name,contentum,clavis))
+	
+	if compact :
+		Arbor = CoNLLUTree
+	else :
+		import networkx
+		Arbor = networkx.DiGraph
+	
+	if cache.exists() :
+		
+		with open(cache,'rb') as memoria :
+			try :
+				fields, defaults = pickle.load(memoria)
+			except EOFError : #no sentences at all
+				return
+			Row = namedtuple('CoNLLURow', fields)
+			Row.__new__.__defaults__ = defaults
+			values = []
+			while True :
+				try :
+					novelties, sentence, nodes, edges = pickle.load(memoria)
+				except EOFError :
+					break
+				values.extend(novelties)
+				tree = Arbor()
+				for n,r in nodes :
+					tree.add_node(values[n],features=Row._make([dict(values[v]) if type(values[v]) is dict else values[v] for v in r])) #dictionaries are copied, as they might be modified
+				for h,d in edges :
+					tree.add_edge(values[h],values[d])
+				yield dict(sentence), tree
+		return
+	#
+	
+	codes = {}
+	def encode(v,novelties) : 
+		k = (dict,tuple(v.items())) if type(v) is dict else (UDFeatures,v.source) if isinstance(v,UDFeatures) else (tuple,tuple(map(type,v)),v) if type(v) is tuple else (type(v),v) #interned bundles are stored through their string; (1,0) and (1.0,0) are equal, but not the same value
+		if k not in codes :
+			codes[k] = len(codes)
+			novelties.append(dict(v) if type(v) is dict else v)
+		return codes[k]
+	#
+	
+	provisional = cache.with_name('{}.{}.part'.format(cache.name,os.getpid())) #readings of the same file in parallel (e.g. by Batch.py) each write their own, the last one replacing the others
+	try :
+		with open(provisional,'wb') as memoria :
+			header = False
+			for sentence, tree in readCoNLLU(conllu,compact=compact,**kwargs) :
+				novelties = []
+				nodes = []
+				for n,row in (tree.features.items() if isinstance(tree,CoNLLUTree) else tree.nodes(data='features')) :
+					if row is None : #a node only known as a head, which will be recreated by its edges
+						continue
+					if not header :
+						pickle.dump((row._fields,row.__new__.__defaults__),memoria,protocol=pickle.HIGHEST_PROTOCOL)
+						header = True
+					nodes.append((encode(n,novelties),tuple([encode(v,novelties) for v in row])))
+				edges = [(encode(h,novelties),encode(d,novelties)) for h,d in tree.edges()]
+				pickle.dump((novelties,tuple(sentence.items()),nodes,edges),memoria,protocol=pickle.HIGHEST_PROTOCOL)
+				yield sentence, tree
+		#
+		os.replace(provisional,cache)
+		cachae = regex.compile(regex.escape(conllu.name) + r'\.(?:([0-9a-f]{16})\.)?[0-9a-f]{16}\.cache')
+		for vetus in conllu.parent.glob(conllu.name + '.*.cache') : #caches of previous versions of the file (or of a previous version of the cache), whatever their options
+			nomen = cachae.fullmatch(vetus.name)
+			if nomen and nomen.group(1) != contentum :
+				vetus.unlink()
+	finally :
+		if provisional.exists() : #the reading has not been completed
+			provisional.unlink()
+#
+
+#Incremental reading of a CoNLL-U file. Every sentence is processed by a method (taking its metadata and tree) returning its contribution to some aggregation; contributions are stored in a state file together with the hash of the text of their sentence. At the next reading, only new or modified sentences are parsed and processed, while contributions of unchanged ones are taken from the state, which is then updated (dropping removed sentences). A fingerprint (e.g. of the configuration of the extraction) invalidates the whole state when it changes
+#It returns the list of contributions of all sentences in the order of the file (None for sentences not yielded by readCoNLLU, whose parameters can be passed on), and the number of sentences which had to be processed
+def incrementCoNLLU(conllu,state,process,fingerprint='',**kwargs) :
+	
+	import pickle, hashlib, os
+	
+	encoding = kwargs.get('encoding','utf8')
+	comments = kwargs.get('comments','#')
+	
+	previous = {}
+	if os.path.exists(state) :
+		with open(state,'rb') as intro :
+			vestigium, previous = pickle.load(intro)
+		if vestigium != fingerprint :
+			previous = {}
+	#
+	
+	hashes = []
+	contributions = {}
+	novelties = {}
+	for i,span,text in blocksCoNLLU(conllu,comments=comments,sents=kwargs.get('sents','sent_id'),encoding=encoding,text=True) :
+		h = hashlib.blake2b(text,digest_size=16).hexdigest()
+		hashes.append(h)
+		if h in previous :
+			contributions[h] = previous[h]
+		else :
+			novelties[h] = text #only the text of new sentences is kept
+	#
+	#New sentences go through the same reading, each introduced by a comment with its hash, so as to recognise it
+	rows = (r for h,text in novelties.items() for r in ['{} incrementum = {}'.format(comments,h)] + text.decode(encoding).splitlines() + [''])
+	for sentence, tree in readCoNLLU(conllu,rows=rows,**kwargs) :
+		contributions[sentence.pop('incrementum')] = process(sentence,tree)
+	for h in novelties : #sentences not yielded (e.g. not selected) are known as well, so as not to be read again
+		contributions.setdefault(h,None)
+	#
+	
+	provisional = str(state) + '.part'
+	with open(provisional,'wb') as exo :
+		pickle.dump((fingerprint,contributions),exo,protocol=pickle.HIGHEST_PROTOCOL)
+	os.replace(provisional,state)
+	
+	return [contributions.get(h) for h in hashes], len(novelties)
+#
+
+#Reads a CoNLL-U file once and feeds every sentence to all registered consumers, in their order. A consumer requiring syntax only receives the trees that readCoNLLU would yield with syntax=True, so that extractions with and without syntax can share the same pass and the same trees
+#Other parameters are passed on to readCoNLLU
+def traverseCoNLLU(conllu,consumers,**kwargs) :
+	
+	kwargs['syntax'] = all(c.syntax for c in consumers) #every sentence is read, syntax is checked per consumer (unless all of them require it, so that the others are just skipped)
+	if kwargs.get('fields') is not None and any(c.syntax for c in consumers) :
+		kwargs['fields'] = set(kwargs['fields']) | {'head'}
+	
+	for sentence, tree in readCoNLLU(conllu,**kwargs) :
+		syntactic = hassyntax(tree)
+		for c in consumers :
+			if syntactic or not c.syntax :
+				c.function(sentence,tree)
 #
 
 #Produces a dictionary out of a feats-like string, taking into account possible multiple values for a feature with tuples
@@ -125,9 +798,32 @@ def readUDfeatures(ftstring,null=('_',),sepfeat='|',sepval='=',sepint=',') :
 		return { f:tuple(v.split(sepint)) for f,v in [ft.split(sepval,maxsplit=1) for ft in ftstring.split(sepfeat) if ft not in null and sepval in ft]} #tries to make up for faulty strings (e.g. empty values)
 #
 
-#The inverse of the previous method, either from a dictionary or a named tuple
+#Table of interned feature bundles, by original string (see UDFeatures)
+featurebundles = {}
+
+#Same as readUDfeatures with default parameters, but returning an immutable bundle of features shared by all identical strings (see UDFeatures). With lazy=True, a new bundle is decoded only at its first access (see LazyUDFeatures)
+def internUDfeatures(ftstring,lazy=False) :
+	
+	bundle = featurebundles.get(ftstring)
+	
+	if bundle is None :
+		bundle = LazyUDFeatures() if lazy else UDFeatures(readUDfeatures(ftstring))
+		bundle.id = len(featurebundles)
+		bundle.source = ftstring
+		bundle.string = None
+		featurebundles[ftstring] = bundle
+	
+	return bundle
+#
+
+#The inverse of the previous methods, either from a dictionary or a named tuple. The string of an interned bundle is computed only once
 def writeUDfeatures(tfeats,sepfeat='|',sepval='=',sepint=',') : 
 	
+	if isinstance(tfeats,UDFeatures) and (sepfeat,sepval,sepint) == ('|','=',',') :
+		if tfeats.string is None :
+			tfeats.string = writeUDfeatures(dict(tfeats))
+		return tfeats.string
+	
 	if not any(tfeats.values()) : #even if we have feature names, if they are empty it means they have not to be annotated
 		return '_'
 	else : 
@@ -140,45 +836,118 @@ def writeUDfeatures(tfeats,sepfeat='|',sepval='=',sepint=',') :
 
 #Returns a node of the syntactic tree as a set of features
 def conllunode(a,i) :
+	if isinstance(a,CoNLLUTree) :
+		return a.features[i]
 	return a.nodes[i]['features']
 #	
 
 #Returns only syntactic words
 def syntacticwords(tree) : 
-	for n in sorted(tree) : 
-		if n[0] > 0 and n[1] == 0 :
-			yield conllunode(tree,n) #tree.nodes[n]['features']
+	if isinstance(tree,CoNLLUTree) :
+		return iter(tree.words()) #already sorted once and for all
+	return (conllunode(tree,n) for n in sorted(tree) if n[0] > 0 and n[1] == 0) #tree.nodes[n]['features']
+#
+
+#Tells whether a tree has at least one syntactic relation
+def hassyntax(tree) :
+	if isinstance(tree,CoNLLUTree) :
+		return tree.number_of_edges() > 0
+	from networkx.classes.function import is_empty
+	return not is_empty(tree)
 #
 
 #Given a node in a syntactic trees, it extracts a subtree satisfying all conditions for dependency relations and/or parts of speech (set as functional by default, returning it in form of a named tuple combining and counting forms/lemmas/POS/relations/features
 #The node is represented just by the index
 def extractnucleus(tree,node,funcrel=('expl','advmod','discourse','aux','cop','mark','nummod','det','clf','case','cc','punct'),funcpos=('ADV','ADP','AUX','CCONJ','DET','INTJ','NUM','PART','PRON','SCONJ','PUNCT'),multi=('flat','fixed','goeswith')) : 
 	
-	import networkx as nx
 	from itertools import chain
-	from collections import Counter, namedtuple
 	
-	Nucleus = namedtuple('Nucleus', 'ids forms lemmas upos feats deprels') 
-
-	criteria = lambda x : ((tree.nodes[x]['features'].deprel.split(':')[0] in funcrel if funcrel else True) and (tree.nodes[x]['features'].upos in funcpos if funcpos else True)) or (tree.nodes[x]['features'].deprel.split(':')[0] in multi if multi else False)
+	criteria = lambda x : ((conllunode(tree,x).deprel.split(':')[0] in funcrel if funcrel else True) and (conllunode(tree,x).upos in funcpos if funcpos else True)) or (conllunode(tree,x).deprel.split(':')[0] in multi if multi else False)
 		
 	nucleus = [node]
-	corona = list(filter(criteria, nx.descendants_at_distance(tree,node,1)))
+	corona = list(filter(criteria, tree.successors(node))) #works both for Networkx graphs and CoNLLUTree
 	nucleus.extend(corona)
 	
 	while corona :
-		corona = list(chain.from_iterable([filter(criteria, nx.descendants_at_distance(tree,c,1)) for c in corona]))
+		corona = list(chain.from_iterable([filter(criteria, tree.successors(c)) for c in corona]))
 		nucleus.extend(corona)
 	#
 	
+	return combinenucleus(tree,node,nucleus)
+#	
+
+#Same as extractnucleus, but for several sets of criteria at once (each a dictionary with the parameters funcrel, funcpos and multi of extractnucleus, with the same defaults), all computed in a single traversal of the subtree: a node is explored as long as it belongs to the nucleus of at least one set. Dependents and their base relations are looked up only once per node
+#It returns the list of the corresponding nuclei, in the same order as the criteria
+def extractnuclei(tree,node,criteria) : 
+	
+	funcrel, funcpos, multi = extractnucleus.__defaults__
+	conditions = [(c.get('funcrel',funcrel),c.get('funcpos',funcpos),c.get('multi',multi)) for c in criteria]
+	
+	nuclei = [[node] for c in conditions]
+	corona = [(node,(1 << len(conditions)) - 1)] #every node comes with the mask of the nuclei it belongs to
+	
+	while corona :
+		novacorona = []
+		for n,mask in corona :
+			for c in tree.successors(n) :
+				features = conllunode(tree,c)
+				brel = features.deprel.split(':')[0]
+				cmask = 0
+				for i,(fr,fp,mu) in enumerate(conditions) :
+					if mask >> i & 1 and (((brel in fr if fr else True) and (features.upos in fp if fp else True)) or (brel in mu if mu else False)) :
+						cmask |= 1 << i
+						nuclei[i].append(c)
+				if cmask :
+					novacorona.append((c,cmask))
+		corona = novacorona
+	#
+	
+	return [combinenucleus(tree,node,nucleus) for nucleus in nuclei]
+#
+
+#Nuclei of all the nodes of a tree at once (with the same parameters as extractnucleus), e.g. for heads of embedded clauses: since the criteria only concern dependents, the nucleus of a node is the node itself together with the nuclei of its dependents satisfying them. They are thus computed in a single post-order traversal, reusing those of dependents, so that every node is looked up only once and the time is linear in the size of the tree and of the nuclei returned
+#It returns a dictionary from nodes (except the artificial root, and nodes only known as heads, which have no annotation) to nuclei, identical to those given by extractnucleus for every node
+def extractallnuclei(tree,funcrel=('expl','advmod','discourse','aux','cop','mark','nummod','det','clf','case','cc','punct'),funcpos=('ADV','ADP','AUX','CCONJ','DET','INTJ','NUM','PART','PRON','SCONJ','PUNCT'),multi=('flat','fixed','goeswith')) :
+
+	interni = {} #whether a node belongs to the nucleus of its head
+	for n,features in (tree.features.items() if isinstance(tree,CoNLLUTree) else tree.nodes(data='features')) :
+		if features is None : #a node only known as a head (e.g. the root of a sentence without sent_id), which has no nucleus of its own
+			continue
+		brel = features.deprel.split(':')[0]
+		interni[n] = ((brel in funcrel if funcrel else True) and (features.upos in funcpos if funcpos else True)) or (brel in multi if multi else False)
+	#
+	dipendenti = {c for n in tree for c in tree.successors(n)}
+	ordo = [] #nodes in pre-order, from every node without a head (the root, and headless nodes such as multiword tokens)
+	for radix in tree :
+		if radix not in dipendenti :
+			pila = [radix]
+			while pila :
+				n = pila.pop()
+				ordo.append(n)
+				pila.extend(tree.successors(n))
+	#
+	membra = {}
+	for n in reversed(ordo) : #dependents before their heads
+		membra[n] = [n]
+		for c in tree.successors(n) :
+			if interni.get(c) :
+				membra[n].extend(membra[c])
+
+	return {n : combinenucleus(tree,n,membra[n]) for n in tree if n in membra and n in interni and n != (0,0)}
+#
+
+#Combines the nodes of a nucleus (see extractnucleus) into a named tuple
+def combinenucleus(tree,node,nucleus) :
+	
 	nucleus = sorted(nucleus) #it might be useful to keep the linear order of the nucleus, especially for printing the form sequence
+	rows = [conllunode(tree,i) for i in nucleus]
 	
 	combonucleus = Nucleus(ids = nucleus,\
-						   forms = tuple([tree.nodes[i]['features'].form for i in nucleus]),\
-						   lemmas = tuple([tree.nodes[i]['features'].lemma for i in nucleus]),\
-						   upos = tuple([tree.nodes[i]['features'].upos for i in nucleus]),\
-						   feats = featsfusion([tree.nodes[i]['features'].feats for i in nucleus]),\
-						   deprels = tuple([tree.nodes[i]['features'].deprel for i in set(nucleus) - {node}]) ) #we usually do not want the relation of our subtree's root, as it is "external" #!Asymmetry with the other lists
+						   forms = tuple([r.form for r in rows]),\
+						   lemmas = tuple([r.lemma for r in rows]),\
+						   upos = tuple([r.upos for r in rows]),\
+						   feats = featsfusion([r.feats for r in rows]),\
+						   deprels = tuple([conllunode(tree,i).deprel for i in set(nucleus) - {node}]) ) #we usually do not want the relation of our subtree's root, as it is "external" #!Asymmetry with the other lists
 	
 	return combonucleus
 #	
@@ -186,21 +955,47 @@ def extractnucleus(tree,node,funcrel=('expl','advmod','discourse','aux','cop','m
 #Other manipulations of data
 
 #It takes a list of feats-like dictionaries and fuses it in one, taking into count the multiplicity of feature values (e.g. Polarity=Neg appearing twice as opposed to once, which can make a difference in some languages)
+#Interned bundles (see UDFeatures) are counted by their identifier and fused only once each, weighted by their multiplicity
 def featsfusion(flist) : 
 
 	from collections import defaultdict,Counter
-	import collections.abc
 	
 	fusion = defaultdict(Counter)
 	
+	#Occurrences are grouped in order of first appearance, so that the order of features and values is the same as a fusion one by one
+	gradus = []
+	bundles = {}
 	for d in flist :
-		for k,v in d.items() :
-			
-			multi = isinstance(v,collections.abc.Iterable) and not isinstance(v,str) #we accept both bare values, or tuples of values
-			
-			fusion[k].update(v if multi else tuple(v,))
+		if isinstance(d,UDFeatures) :
+			if d.id in bundles :
+				gradus[bundles[d.id]][1] += 1
+				continue
+			bundles[d.id] = len(gradus)
+		gradus.append([d,1])
+	#
+	
+	for d,n in gradus :
+		featsfold(fusion,d,n)
 	#
 	
 	return dict(**fusion) #better than a defaultdict as absent values will return a KeyError
 #
 
+#Online version of featsfusion: it folds a feats-like dictionary (counted n times) into a fusion being accumulated, a defaultdict of counters, and returns it. Folding the dictionaries of a list one by one gives exactly the result of featsfusion on it (once turned into a dictionary), without keeping the list
+def featsfold(fusion,d,n=1) :
+	
+	import collections.abc
+	
+	for k,v in d.items() :
+		
+		multi = isinstance(v,collections.abc.Iterable) and not isinstance(v,str) #we accept both bare values, or tuples of values
+		
+		if n == 1 : 
+			fusion[k].update(v if multi else tuple(v,))
+		else :
+			for x in (v if multi else tuple(v,)) :
+				fusion[k][x] += n
+	
+	return fusion
+#
+
@@ -0,0 +1,113 @@
+#The following code has been developed by Flavio Massimiliano Cecchini as part of the work presented in "Quid verbumst? Applying a definition of word to Latin in Universal Dependencies", SyntaxFest 2025, Ljubljana. Please give credit to the author if you use any part of it.
+#Contact: flaviomassimiliano.cecchini at kuleuven.be
+
+#Optional columnar copies of the tables written by the scripts, in Parquet or Arrow (IPC file) format, with typed columns: lists of sentence identifiers and forms, features as maps from names to lists of values, parts of speech and lemmas dictionary-encoded. Rows are accumulated and written in batches
+#They need pyarrow, which is imported only when a format is chosen
+
+formati = {'parquet' : '.parquet', 'arrow' : '.arrow'}
+batch = 1 << 16 #rows per batch
+
+#Checks the chosen format (none, parquet or arrow) at the beginning of a run, so that a missing pyarrow is found before the extraction. It returns the format, or None
+def formatum(valore) :
+	valore = (valore or 'none').strip().lower()
+	if valore in ('none','false','') :
+		return None
+	if valore not in formati :
+		raise ValueError('Unknown columnar format: {} (none, parquet or arrow).'.format(valore))
+	try :
+		import pyarrow
+	except ImportError :
+		raise ImportError('The columnar output ({}) needs pyarrow: install it, or set columnar to none.'.format(valore))
+	return valore
+#
+
+#Arrow type of every kind of column: dictionary-encoded strings (for values repeated across rows), strings, integers, reals, lists of strings, features (a dictionary from names to values, either bare or tuples) and maps from strings to reals or integers
+def tipo(genus) :
+	import pyarrow as pa
+	return {'dict' : pa.dictionary(pa.int32(),pa.string()),\
+			'string' : pa.string(),\
+			'int' : pa.int64(),\
+			'float' : pa.float64(),\
+			'list' : pa.list_(pa.string()),\
+			'feats' : pa.map_(pa.string(),pa.list_(pa.string())),\
+			'floatmap' : pa.map_(pa.string(),pa.float64()),\
+			'intmap' : pa.map_(pa.string(),pa.int64())}[genus]
+#
+
+#Conversion of a value to what pyarrow expects for its kind of column; features are ordered and sorted as in writeUDfeatures, and empty ones are dropped
+def valor(genus,v) :
+	if genus == 'list' :
+		return list(v)
+	if genus == 'feats' :
+		return [(f,sorted((x,) if isinstance(x,str) else x)) for f,x in sorted(v.items(), key = lambda x : x[0].lower()) if x]
+	if genus in ('floatmap','intmap') :
+		return list(v.items()) if isinstance(v,dict) else list(v)
+	return v
+#
+
+#Writer of a table with the given columns, a sequence of couples (name, kind); rows are added with append, in the same order as the columns
+#Dictionary-encoded columns keep a single dictionary for the whole table, only growing from a batch to the next, so that also Arrow files can store it (as deltas)
+class Tabula :
+
+	def __init__(self,percorso,colonne,formato='parquet') :
+		import pyarrow as pa
+		self.percorso = str(percorso) + formati[formato]
+		self.nomi = [n for n,_ in colonne]
+		self.generi = [g for _,g in colonne]
+		self.schema = pa.schema([(n,tipo(g)) for n,g in colonne])
+		self.formato = formato
+		self.righe = [[] for _ in colonne]
+		self.dizionari = [{} for _ in colonne]
+		self.scrittore = None
+
+	def append(self,*valori) :
+		for i,v in enumerate(valori) :
+			if self.generi[i] == 'dict' :
+				self.righe[i].append(self.dizionari[i].setdefault(v,len(self.dizionari[i])))
+			else :
+				self.righe[i].append(valor(self.generi[i],v))
+		if len(self.righe[0]) >= batch :
+			self.flush()
+
+	#Writes the accumulated rows as a batch
+	def flush(self) :
+		import pyarrow as pa
+		if self.scrittore is None :
+			if self.formato == 'parquet' :
+				import pyarrow.parquet as pq
+				self.scrittore = pq.ParquetWriter(self.percorso,self.schema)
+			else :
+				self.scrittore = pa.ipc.new_file(self.percorso,self.schema,options=pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True))
+		if self.righe[0] :
+			colonne = [pa.DictionaryArray.from_arrays(pa.array(r,type=pa.int32()),pa.array(list(d),type=pa.string())) if g == 'dict' else pa.array(r,type=tipo(g)) for r,g,d in zip(self.righe,self.generi,self.dizionari)]
+			self.scrittore.write_batch(pa.record_batch(colonne,schema=self.schema))
+			self.righe = [[] for _ in self.nomi]
+
+	def close(self) :
+		self.flush() #also an empty table is written
+		self.scrittore.close()
+
+	def __enter__(self) :
+		return self
+
+	def __exit__(self,*exc) :
+		self.close()
+#
+
+#Writer doing nothing, when no columnar output is requested
+class Nulla :
+
+	def append(self,*valori) :
+		pass
+
+	def __enter__(self) :
+		return self
+
+	def __exit__(self,*exc) :
+		pass
+#
+
+#Writer of the columnar copy of a table (named as the table, without extension), or a writer doing nothing if no format is given
+def columnar(nome,colonne,formato=None) :
+	return Tabula(nome,colonne,formato) if formato else Nulla()
+#
@@ -0,0 +1,149 @@
+#The following code has been developed by Flavio Massimiliano Cecchini as part of the work presented in "Quid verbumst? Applying a definition of word to Latin in Universal Dependencies", SyntaxFest 2025, Ljubljana. Please give credit to the author if you use any part of it.
+#Contact: flaviomassimiliano.cecchini at kuleuven.be
+
+import time
+
+#Instrumentation of a run divided in named stages (e.g. loading of resources, reading, writing...): for each stage it records wall and CPU time, the sentences and tokens it processed, and the peak resident memory of the process at its end. Repeated stages accumulate
+#Progress is printed at most once per interval. Optionally, the whole run is profiled with cProfile or tracemalloc (which also gives the peak of allocated memory of each stage); everything is written to a JSON file at the end, if a path is given
+class Mensura :
+
+	def __init__(self,nome,percorso=None,profilo=None,scribere=True,intervallum=1.0) :
+		self.nome = nome
+		self.profilo = profilo.lower() if profilo and profilo.lower() not in ('none','false') else None
+		self.percorso = percorso if scribere or self.profilo else None #a profile is always written
+		self.intervallum = intervallum
+		self.stadia = {}
+		self.aperti = {}
+		self.sententiae = 0
+		self.tokens = 0
+		self.inizio = (time.perf_counter(),time.process_time())
+		self.ultimo = self.inizio[0]
+		#
+		self.profiler = None
+		if self.profilo == 'cprofile' :
+			import cProfile
+			self.profiler = cProfile.Profile()
+			self.profiler.enable()
+		elif self.profilo == 'tracemalloc' :
+			import tracemalloc
+			tracemalloc.start()
+		elif self.profilo is not None :
+			raise ValueError('Unknown profiler: {} (cprofile or tracemalloc)'.format(profilo))
+
+	#Record of a stage, created at its first use
+	def stadium(self,nome) :
+		return self.stadia.setdefault(nome,{'calls' : 0, 'wall' : 0.0, 'cpu' : 0.0, 'sentences' : 0, 'tokens' : 0})
+
+	#Context manager around a stage
+	def stage(self,nome) :
+		return Stadium(self,nome)
+
+	#Beginning and end of a stage, for long blocks of code
+	def start(self,nome) :
+		self.aperti[nome] = Stadium(self,nome).__enter__()
+
+	def stop(self,nome) :
+		self.aperti.pop(nome).__exit__()
+
+	#Function treating a single sentence, whose calls and times accumulate into a stage #NB: allocated memory is not traced here, as stages of this kind run within other stages
+	def wrap(self,nome,functio) :
+		record = self.stadium(nome)
+		def involuta(*args,**kwargs) :
+			w, c = time.perf_counter(), time.process_time()
+			try :
+				return functio(*args,**kwargs)
+			finally :
+				record['calls'] += 1
+				record['sentences'] += 1
+				record['wall'] += time.perf_counter() - w
+				record['cpu'] += time.process_time() - c
+		return involuta
+
+	#Adds processed sentences and tokens to a stage
+	def count(self,nome,sentences=0,tokens=0) :
+		record = self.stadium(nome)
+		record['sentences'] += sentences
+		record['tokens'] += tokens
+
+	#Progress over sentences, printed at most once per interval (with a running throughput)
+	def progress(self,sentid,tokens=0) :
+		self.sententiae += 1
+		self.tokens += tokens
+		ora = time.perf_counter()
+		if ora - self.ultimo >= self.intervallum :
+			self.ultimo = ora
+			print('{}\t{} sentences, {} tokens ({:.0f} tokens/s)'.format(sentid,self.sententiae,self.tokens,self.tokens / (ora - self.inizio[0])),end='\r',flush=True)
+
+	#Metrics of the whole run, with the profile if requested
+	def metrics(self) :
+
+		import resource, sys
+
+		unitas = 1 if sys.platform == 'darwin' else 1024 #ru_maxrss is in bytes on macOS, in kilobytes elsewhere
+		metrica = {'script' : self.nome,\
+				   'wall' : time.perf_counter() - self.inizio[0],\
+				   'cpu' : time.process_time() - self.inizio[1],\
+				   'sentences' : self.sententiae,\
+				   'tokens' : self.tokens,\
+				   'peak_rss' : resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unitas,\
+				   'peak_rss_children' : resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unitas,\
+				   'stages' : self.stadia}
+		#
+		if self.profiler is not None :
+			import pstats
+			self.profiler.disable()
+			statistica = pstats.Stats(self.profiler)
+			metrica['profile'] = [{'function' : '{}:{}({})'.format(*f), 'calls' : v[1], 'tottime' : v[2], 'cumtime' : v[3]} for f,v in sorted(statistica.stats.items(),key = lambda x : x[1][3],reverse=True)[:50]]
+			self.profiler.enable()
+		elif self.profilo == 'tracemalloc' :
+			import tracemalloc
+			metrica['profile'] = [{'line' : str(s.traceback), 'size' : s.size, 'count' : s.count} for s in tracemalloc.take_snapshot().statistics('lineno')[:50]]
+
+		return metrica
+
+	#Writes the metrics to the JSON file (if any), and the complete cProfile statistics next to it
+	def dump(self) :
+
+		if self.percorso is None :
+			return
+
+		import json
+
+		metrica = self.metrics()
+		if self.profiler is not None :
+			self.profiler.dump_stats(str(self.percorso) + '.prof')
+		with open(self.percorso,'w',encoding='utf8') as exo :
+			json.dump(metrica,exo,indent=1)
+#
+
+#A stage within a run, see Mensura.stage
+class Stadium :
+
+	def __init__(self,mensura,nome) :
+		self.mensura = mensura
+		self.record = mensura.stadium(nome)
+
+	def __enter__(self) :
+		if self.mensura.profilo == 'tracemalloc' :
+			import tracemalloc
+			tracemalloc.reset_peak()
+		self.w, self.c = time.perf_counter(), time.process_time()
+		return self
+
+	def __exit__(self,*exc) :
+
+		import resource, sys
+
+		self.record['calls'] += 1
+		self.record['wall'] += time.perf_counter() - self.w
+		self.record['cpu'] += time.process_time() - self.c
+		self.record['peak_rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+		if self.mensura.profilo == 'tracemalloc' :
+			import tracemalloc
+			self.record['peak_traced'] = max(self.record.get('peak_traced',0),tracemalloc.get_traced_memory()[1])
+
+	#Adds processed sentences and tokens to this stage
+	def count(self,sentences=0,tokens=0) :
+		self.record['sentences'] += sentences
+		self.record['tokens'] += tokens
+#
@@ -1,11 +1,25 @@
 #The following code has been developed by Flavio Massimiliano Cecchini as part of the work presented in "Quid verbumst? Applying a definition of word to Latin in Universal Dependencies", SyntaxFest 2025, Ljubljana. Please give credit to the author if you use any part of it. 
 #Contact: flaviomassimiliano.cecchini at kuleuven.be
 
+import regex, unicodedata
+from functools import lru_cache
+
+#Patterns and tables are compiled only once
+diacritica = regex.compile(r'(\p{M})')
+interpunctiones = regex.compile(r'( |\p{P})')
+orthographia = str.maketrans({'j':'i','v':'u','&':'et'})
+
 #Light, Latin-oriented normalisation function #removes any diacritics; lowercases; replaces v with u, j with i, & with et; removes any kind of punctuation mark (so much for in-quantum or vol'); removes spaces #Note: this annihilates punctuation marks
+#Results are memoised in a bounded cache, as the same forms and lemmas recur over and over in a treebank
+@lru_cache(maxsize=1<<18)
 def orthonormalizatio(s,diacritics=False) :
-	import regex,unicodedata
 	#
 	if not diacritics :
-		s = regex.sub(r'(\p{M})','',unicodedata.normalize('NFKD',s))
-	return regex.sub(r'( |\p{P})','',s.lower()).replace('j','i').replace('v','u').replace('&','et')
+		s = diacritica.sub('',unicodedata.normalize('NFKD',s))
+	return interpunctiones.sub('',s.lower()).translate(orthographia)
+#
+
+#Batch version of the previous function, normalising an iterable of strings in one call and returning them in the same order
+def orthonormalizationes(ss,diacritics=False) :
+	return [orthonormalizatio(s,diacritics) for s in ss]
 #
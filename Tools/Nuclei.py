@@ -0,0 +1,224 @@
+#The following code has been developed by Flavio Massimiliano Cecchini as part of the work presented in "Quid verbumst? Applying a definition of word to Latin in Universal Dependencies", SyntaxFest 2025, Ljubljana. Please give credit to the author if you use any part of it.
+#Contact: flaviomassimiliano.cecchini at kuleuven.be
+
+#Clausal free forms (see FreeForms.py): their definition by means of relations and parts of speech, their identification in a tree, and a persistent index of the syntactically annotated sentences of a treebank, against which the extraction can be run again with other definitions without reading the treebank
+#The index is a SQLite database storing, for every syntactic word, only what the extraction depends on: its head, base relation, part of speech, VerbForm, lemma, and normalised lemma and form
+
+from collections import namedtuple, defaultdict
+from CoNLLUToolsmini import UDPos, CoNLLUTree, readCoNLLU, hashCoNLLU, syntacticwords, conllunode, extractnuclei, internUDfeatures
+
+#Version of the index: to be increased whenever its structure changes
+version = 1
+
+#Structure of a syntactic word as stored in the index, with the same accessors as a row of readCoNLLU used by the extraction (see extractnucleus), plus its normalised lemma
+Verbum = namedtuple('Verbum', 'id form lemma ortholemma upos feats deprel')
+Verbum.__new__.__defaults__ = ('_',)*len(Verbum._fields)
+
+#Definition of clausal free forms used in the paper, from the set of all base relations (see Resources): the criteria of the nucleus of a clause and of its subtree without parataxis (see extractnuclei), and the relations of arguments
+def definitiones(allbdeprel) :
+
+	funcpos = {p for p,v in UDPos.items() if 'syn' in v}
+	lexpos = UDPos.keys() - {p for p,v in UDPos.items() if 'alex' in v}
+	phrasalia = ('csubj','ccomp','xcomp','advcl','acl','parataxis')
+	argumenta = ('nsubj','obj','iobj','csubj','ccomp','xcomp','obl','vocative','expl','dislocated','advcl','advmod','discourse')
+	aphrasalia = allbdeprel.difference(phrasalia)
+	singularia = allbdeprel.difference({'parataxis'})
+	sincipita = ('fixed','flat')
+
+	return {'nucleus' : dict(funcrel=aphrasalia,funcpos=funcpos,multi=sincipita), 'subtree' : dict(funcrel=singularia,funcpos=lexpos,multi=sincipita), 'arguments' : argumenta}
+#
+
+#Modification of a definition (see above) by a specification, as read from JSON: for the nucleus and the subtree, any of funcrel, funcpos and multi, and the arguments, each either replaced by a list (an empty one or null for no condition) or changed by a dictionary with values to add and/or remove, e.g. {"nucleus" : {"funcpos" : {"remove" : ["ADV"]}}, "arguments" : {"add" : ["nmod"]}}
+def definire(definitio,specificatio) :
+
+	def mutare(valor,mutatio) :
+		if isinstance(mutatio,dict) :
+			if set(mutatio) - {'add','remove'} :
+				raise ValueError('Only add and remove can change a definition: {}.'.format(', '.join(sorted(set(mutatio) - {'add','remove'}))))
+			return (set(valor or ()) | set(mutatio.get('add',()))) - set(mutatio.get('remove',()))
+		return set(mutatio) if mutatio else None
+	#
+	if set(specificatio) - {'nucleus','subtree','arguments'} :
+		raise ValueError('Unknown parts of a definition: {} (nucleus, subtree, arguments).'.format(', '.join(sorted(set(specificatio) - {'nucleus','subtree','arguments'}))))
+	nova = {'nucleus' : dict(definitio['nucleus']), 'subtree' : dict(definitio['subtree']), 'arguments' : definitio['arguments']}
+	for pars in ('nucleus','subtree') :
+		for c,v in specificatio.get(pars,{}).items() :
+			if c not in ('funcrel','funcpos','multi') :
+				raise ValueError('Unknown criterion of the {}: {} (funcrel, funcpos, multi).'.format(pars,c))
+			nova[pars][c] = mutare(nova[pars][c],v)
+	if 'arguments' in specificatio :
+		nova['arguments'] = mutare(nova['arguments'],specificatio['arguments']) or ()
+
+	return nova
+#
+
+#Identification of clausal free forms in a tree, given the criteria of the nucleus and of the subtree (see extractnuclei), the relations of arguments and the remapping of parts of speech. It returns the number of roots not in a co-ordination, and the list of those heading a free form, each with its nucleus
+def clausalia(a,criteria,argumenta,corrpos) :
+
+	radices = 0
+	liberae = []
+
+	for l in syntacticwords(a) :
+
+		brel = l.deprel.split(':')[0]
+
+		#We start the extraction from roots, but exclude those that are found in a co'ordination
+		if brel == 'root' and not any([conllunode(a,nd).deprel.split(':')[0] == 'conj' for nd in a[l.id]]) :
+
+			radices += 1
+
+			nucleus, subarbor = extractnuclei(a,l.id,criteria) #both at once: the nucleus proper, and the subtree of all non-paratactic dependents #we ignore possible conjuncts of dependents (e.g. "can [and must] work"; "this [and that] thing")
+			bnrels = {dr.split(':')[0] for dr in nucleus.deprels}
+
+			#We check that we really just have a sentence coinciding with a nucleus, in other words, a simple clause with no extensions or nested clauses (ignoring co-ordination). We further exclude marked elliptical structures (orphan); require the clause to be "finite" (this criterion might need adjustments for different languages in the current state of UD annotation); and given the unclear status of ADV (straddling the grammaticality cline), we exclude clauses which have an ADV in the arguments, since we require only the head be autosemantic, if ever
+			if not set(subarbor.ids).difference(nucleus.ids) \
+			and 'orphan' not in bnrels \
+			and ('Fin' in nucleus.feats.get('VerbForm',()) or bnrels.intersection(argumenta)) \
+			and not any([corrpos['ADV'](nucleus.lemmas[i]) == 'ADV' for i,d in enumerate(nucleus.ids) if d != l.id and nucleus.upos[i] == 'ADV']) :
+				liberae.append((l,nucleus))
+
+	return radices, liberae
+#
+
+#Table of clausal free forms (named as the table, without extension), from their types by part of speech and lemma of the head, each with its sentences and relations; with a format, a columnar copy is written as well (see Columnar)
+#It returns, by part of speech, the numbers of types, of single-form types, of lexemes and of lexemes with single-form types, and a random type as an example
+def tabulafreeforms(syntagmata,nome,colonnare=None) :
+
+	import random
+	from Columnar import columnar
+
+	freeheadpos = {}
+	randoff = {}
+
+	with open(nome + '.tsv','w',encoding='utf8') as exo, columnar(nome,(('pos','dict'),('lemma','dict'),('nucleus','string'),('forms','list'),('sentences','list'),('relations','list')),colonnare) as colonne :
+		for p,lnnn in syntagmata.items() :
+
+			numtypi = 0
+			numsingtypi = 0
+			numlemmasing = 0
+
+			for l,ntypi in lnnn.items() :
+
+				numtypi += len(ntypi)
+				sing = len([n for n in ntypi if len(n.split()) == 1])
+				numlemmasing += 1 if sing else 0
+				numsingtypi += sing
+
+				randoff[p] = random.choice(list(ntypi.keys()))
+
+				for n,sr in ntypi.items() :
+					sententiae = set(iter(sr['sent'])) #sentences are kept in order of insertion (also across merged partial results, see Partials), and added one by one so as to be listed as with a set filled while reading
+					exo.write('{}\t{}\t{}\t{}\t{}\t{}\n'.format(p,\
+									   					l,\
+														n,\
+									   					len(n.split()),\
+									   					len(ntypi[n]),\
+														','.join(sententiae)\
+													   ))
+					colonne.append(p,l,n,n.split(),sententiae,sorted(sr['rel']))
+			#
+			freeheadpos[p] = (numtypi,numsingtypi,len(lnnn),numlemmasing)
+
+	return freeheadpos, randoff
+#
+
+
+##Index
+
+#Writes the index of the syntactically annotated sentences of a CoNLL-U file to a SQLite database (replaced only when complete), with forms and lemmas normalised by the given function(s). A fingerprint (e.g. of the normaliser) is stored together with the hash of the treebank, to tell whether the index is still current (see NucleusIndex)
+#Other parameters are passed on to readCoNLLU. It returns the number of sentences indexed
+def indexnuclei(conllu,percorso,normalizator=str.lower,normalizatores=None,fingerprint='',**kwargs) :
+
+	import sqlite3, os
+	from pathlib import Path
+
+	if normalizatores is None :
+		normalizatores = lambda xx : list(map(normalizator,xx))
+	percorso = Path(percorso)
+	provisional = percorso.with_name(percorso.name + '.part')
+	if provisional.exists() :
+		provisional.unlink()
+
+	kwargs.update(syntax=True,compact=True,fields=('form','lemma','upos','feats','head','deprel'),lazy=True)
+	sentences = 0
+	try :
+		with sqlite3.connect(provisional) as connexio :
+			connexio.executescript('''CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+									  CREATE TABLE sentences (sid INTEGER PRIMARY KEY, sent_id TEXT);
+									  CREATE TABLE words (sid INTEGER, node INTEGER, head INTEGER, deprel TEXT, upos TEXT, verbform TEXT, lemma TEXT, ortholemma TEXT, form TEXT, PRIMARY KEY (sid,node)) WITHOUT ROWID;''')
+			for s,a in readCoNLLU(conllu,**kwargs) :
+				verba = list(syntacticwords(a))
+				formae = normalizatores([v.form for v in verba])
+				connexio.execute('INSERT INTO sentences VALUES (?,?)',(sentences,s.get('sent_id')))
+				connexio.executemany('INSERT INTO words VALUES (?,?,?,?,?,?,?,?,?)',[(sentences,int(v.id[0]),v.head[0] if isinstance(v.head,tuple) else None,v.deprel.split(':')[0],v.upos,','.join(v.feats.get('VerbForm',())) or None,v.lemma,normalizator(v.lemma),f) for v,f in zip(verba,formae)])
+				sentences += 1
+			connexio.executemany('INSERT INTO meta VALUES (?,?)',[('version',str(version)),('treebank',hashCoNLLU(conllu)),('fingerprint',fingerprint),('sentences',str(sentences))])
+		connexio.close()
+		os.replace(provisional,percorso)
+	finally :
+		if provisional.exists() : #the indexing has not been completed
+			provisional.unlink()
+
+	return sentences
+#
+
+#Index of a treebank written by indexnuclei. Its trees are loaded once, at the first query, so that further queries only cost the extraction itself
+class NucleusIndex :
+
+	def __init__(self,percorso) :
+		import sqlite3
+		from pathlib import Path
+		self.percorso = Path(percorso)
+		if not self.percorso.exists() :
+			raise FileNotFoundError('No index of nuclei at {}.'.format(self.percorso))
+		with sqlite3.connect('file:{}?mode=ro'.format(self.percorso),uri=True) as connexio :
+			self.meta = dict(connexio.execute('SELECT key, value FROM meta'))
+		connexio.close()
+		if int(self.meta.get('version',0)) != version :
+			raise ValueError('The index at {} has version {}, while {} is expected: build it again.'.format(self.percorso,self.meta.get('version'),version))
+		self.alberi = None
+
+	#Whether the index was built from the current content of a treebank (and with the same fingerprint)
+	def current(self,conllu,fingerprint='') :
+		return self.meta['treebank'] == hashCoNLLU(conllu) and self.meta['fingerprint'] == fingerprint
+
+	#Trees of the indexed sentences, in the order of the treebank, as CoNLLUTree whose rows are Verbum
+	def trees(self) :
+
+		import sqlite3
+
+		if self.alberi is None :
+			with sqlite3.connect('file:{}?mode=ro'.format(self.percorso),uri=True) as connexio :
+				self.alberi = []
+				for sid,sentid in connexio.execute('SELECT sid, sent_id FROM sentences ORDER BY sid') :
+					a = CoNLLUTree()
+					a.add_node((0,0),features=Verbum(id=(0,0)))
+					self.alberi.append(({'sent_id' : sentid},a))
+				for sid,node,head,deprel,upos,verbform,lemma,ortholemma,form in connexio.execute('SELECT * FROM words ORDER BY sid, node') :
+					a = self.alberi[sid][1]
+					a.add_node((node,0),features=Verbum((node,0),form,lemma,ortholemma,upos,internUDfeatures('VerbForm=' + verbform if verbform else '_'),deprel))
+					if head is not None :
+						a.add_edge((head,0),(node,0))
+			connexio.close()
+
+		return self.alberi
+
+	#Extraction of clausal free forms with a definition (see definitiones and definire) and a remapping of parts of speech, as in FreeForms.py. It returns their types by part of speech and lemma of the head (see tabulafreeforms), the number of sentences and that of roots not in a co-ordination
+	def freeforms(self,definitio,corrpos) :
+
+		syntagmata = defaultdict(lambda : defaultdict(dict))
+		sentnum = 0
+		radnum = 0
+		criteria = (definitio['nucleus'],definitio['subtree'])
+
+		for s,a in self.trees() :
+			sentnum += 1
+			radices, liberae = clausalia(a,criteria,definitio['arguments'],corrpos)
+			radnum += radices
+			for l,nucleus in liberae :
+				typus = syntagmata[corrpos.get(l.upos, lambda x : l.upos)(l.ortholemma)][l.ortholemma].setdefault(' '.join(nucleus.forms),{'sent' : {}, 'rel' : set()})
+				typus['sent'][s['sent_id']] = None
+				typus['rel'].update(nucleus.deprels)
+
+		return syntagmata, sentnum, radnum
+#
@@ -0,0 +1,64 @@
+#The following code has been developed by Flavio Massimiliano Cecchini as part of the work presented in "Quid verbumst? Applying a definition of word to Latin in Universal Dependencies", SyntaxFest 2025, Ljubljana. Please give credit to the author if you use any part of it.
+#Contact: flaviomassimiliano.cecchini at kuleuven.be
+
+#Partial results of a script: the aggregates built by reading a treebank (or a part of it), before any table is written, stored in a compressed file so that readings done on different machines can be merged afterwards (see Quid.py merge) into exactly what a single reading of all of them would give
+#A file holds a header (format, version, script, tasks whose aggregates it contains, fingerprint of everything which changes them) and the aggregates, as two pickles compressed with gzip
+
+format = 'quidverbumst-partial'
+version = 3 #to be increased whenever the aggregates of a script change structure
+
+#Writes the aggregates of a script to a file, replaced only when complete
+def writepartial(percorso,script,fingerprint,opera,aggregata,treebank=None) :
+
+	import pickle, gzip, os, time
+	from pathlib import Path
+
+	percorso = Path(percorso)
+	provisional = percorso.with_name(percorso.name + '.part')
+	caput = {'format' : format, 'version' : version, 'script' : script, 'tasks' : sorted(opera), 'fingerprint' : fingerprint, 'treebank' : str(treebank) if treebank else None, 'written' : time.strftime('%Y-%m-%d %H:%M:%S')}
+	try :
+		with gzip.open(provisional,'wb',compresslevel=6) as exo :
+			pickle.dump(caput,exo,protocol=pickle.HIGHEST_PROTOCOL)
+			pickle.dump(aggregata,exo,protocol=pickle.HIGHEST_PROTOCOL)
+		os.replace(provisional,percorso)
+	finally :
+		if provisional.exists() :
+			provisional.unlink()
+#
+
+#Header of a file of partial results
+def partialheader(percorso) :
+
+	import pickle, gzip
+
+	try :
+		with gzip.open(percorso,'rb') as intro :
+			caput = pickle.load(intro)
+	except (OSError,EOFError,pickle.UnpicklingError) :
+		caput = None
+	if not isinstance(caput,dict) or caput.get('format') != format :
+		raise ValueError('{} is not a file of partial results.'.format(percorso))
+	if caput['version'] != version :
+		raise ValueError('{} has version {} of partial results, while {} is expected: it has to be written again.'.format(percorso,caput['version'],version))
+	return caput
+#
+
+#Aggregates stored in files of partial results, in the given order, once their headers are checked against the script, its fingerprint and the tasks to be carried out
+def loadpartials(percorsi,script,fingerprint,opera=()) :
+
+	import pickle, gzip
+
+	for percorso in percorsi : #all headers are checked before anything is merged
+		caput = partialheader(percorso)
+		if caput['script'] != script :
+			raise ValueError('{} holds partial results of {}, not of {}.'.format(percorso,caput['script'],script))
+		if caput['fingerprint'] != fingerprint :
+			raise ValueError('{} was written with different parameters, normaliser or resources, and cannot be merged.'.format(percorso))
+		if set(opera) - set(caput['tasks']) :
+			raise ValueError('{} has no results for {}.'.format(percorso,', '.join(sorted(set(opera) - set(caput['tasks'])))))
+	#
+	for percorso in percorsi :
+		with gzip.open(percorso,'rb') as intro :
+			pickle.load(intro)
+			yield pickle.load(intro)
+#
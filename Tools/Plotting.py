@@ -0,0 +1,68 @@
+#The following code has been developed by Flavio Massimiliano Cecchini as part of the work presented in "Quid verbumst? Applying a definition of word to Latin in Universal Dependencies", SyntaxFest 2025, Ljubljana. Please give credit to the author if you use any part of it.
+#Contact: flaviomassimiliano.cecchini at kuleuven.be
+
+#Plots of the distributions of free forms by part of speech of their head, drawn from the tables written by FreeForms.py (singleforms_*.tsv and freeforms_*.tsv, a missing one counting as empty). They are only saved as images, without any window, so they can be drawn on a headless server and at any time after the extraction
+
+#Draws both plots for a language in a directory (by default the current one) and returns the paths of the images
+def plotfreeforms(lang,cartella='.') :
+
+	from pathlib import Path
+	from collections import defaultdict
+	import matplotlib
+	matplotlib.use('Agg') #no window, no blocking
+	from matplotlib import pyplot as plt
+	from CoNLLUToolsmini import UDPos
+
+	cartella = Path(cartella)
+	alexpos = {p for p,v in UDPos.items() if 'alex' in v}
+
+	#Lexemes heading clausal free forms (and those heading single-form ones), and lexemes appearing as single-word sentences, by part of speech
+	lemmata = defaultdict(set)
+	lemmatasing = defaultdict(set)
+	singula = defaultdict(set)
+	if (cartella / 'freeforms_{}.tsv'.format(lang)).exists() :
+		with open(cartella / 'freeforms_{}.tsv'.format(lang),'r',encoding='utf8') as intro :
+			for riga in intro :
+				p, l, _, lunghezza, *_ = riga.rstrip('\n').split('\t')
+				lemmata[p].add(l)
+				if lunghezza == '1' :
+					lemmatasing[p].add(l)
+	if (cartella / 'singleforms_{}.tsv'.format(lang)).exists() :
+		with open(cartella / 'singleforms_{}.tsv'.format(lang),'r',encoding='utf8') as intro :
+			for riga in intro :
+				p, l, *_ = riga.rstrip('\n').split('\t')
+				singula[p].add(l)
+	#
+
+	posord = sorted(UDPos.keys() - alexpos - {'PROPN','NUM','X'}, key = lambda x : len(lemmata[x]),reverse=True) #Attention: this is rather ad hoc with respect to the function corrpos, might need adaptation if you want to keep/visualise specific POS
+	colores = {p : {'omnia': 'r' if 'auto' in UDPos[p] else 'm', 'sing': 'b' if 'auto' in UDPos[p] else 'c'} for p in posord}
+	#
+	data = [len(lemmata[p]) for p in posord]
+	datasing = [len(lemmatasing[p]) for p in posord]
+	datafreesing = [len(singula[p]) for p in posord]
+	datafreemorph = [0]*len(posord)
+	imagines = []
+
+	plt.figure(1)
+	plt.bar(posord,datasing,color=[colores[p]['sing'] for p in posord])
+	plt.bar(posord,[ data[i] - datasing[i] for i,p in enumerate(posord)],bottom=datasing,color=[colores[p]['omnia'] for p in posord])
+	plt.xticks(range(len(posord)), posord)
+	plt.xticks(rotation=60)
+	#
+	imagines.append(cartella / '_'.join(('freeformdistr',lang + '.png')))
+	plt.savefig(imagines[-1],bbox_inches='tight')
+	plt.close(1)
+	#
+
+	plt.figure(2)
+	plt.bar(posord,datafreemorph,color=[colores[p]['sing'] for p in posord])
+	plt.bar(posord,[ datafreesing[i] - datafreemorph[i] for i,p in enumerate(posord)],bottom=datafreemorph,color=[colores[p]['omnia'] for p in posord])
+	plt.xticks(range(len(posord)), posord)
+	plt.xticks(rotation=60)
+	#
+	imagines.append(cartella / '_'.join(('freesingformdistr',lang + '.png')))
+	plt.savefig(imagines[-1],bbox_inches='tight')
+	plt.close(2)
+
+	return imagines
+#
@@ -0,0 +1,162 @@
+#The following code has been developed by Flavio Massimiliano Cecchini as part of the work presented in "Quid verbumst? Applying a definition of word to Latin in Universal Dependencies", SyntaxFest 2025, Ljubljana. Please give credit to the author if you use any part of it. 
+#Contact: flaviomassimiliano.cecchini at kuleuven.be
+
+from collections import namedtuple
+
+#Version of the compiled resources: to be increased whenever their structure or their compilation change
+version = 2
+
+#Structure of the morphological resources used by the scripts: normalised lemmas of derived and compound words, remapping of ADV lemmas to other parts of speech, and all basic UD relations. Radical forms found in LatInfLexi, only needed for Latin by FreeForms.py, are loaded on their own (see loadradicalforms)
+Resources = namedtuple('Resources', 'derivata composita advpos allbdeprel')
+
+#Resources already loaded in this process (e.g. by a batch of extractions, see Batch.py), by directory and identity of the bundle
+caricate = {}
+
+#Loads the morphological resources found in a directory, normalised with the given function(s). They are compiled only once into a binary bundle stored in the same directory, which is reused as long as its version, the source files (by size and time of modification), the language and the normaliser stay the same. Within the same process (and its forks), they are loaded only once
+def loadresources(morphologia,normalizator=str.lower,normalizatores=None,lang='la') : 
+	
+	import os, inspect
+	from pathlib import Path
+	
+	morphologia = Path(morphologia)
+	if normalizatores is None :
+		normalizatores = lambda xx : list(map(normalizator,xx))
+	
+	fontes = ['derived','compound','ADV.tsv','udeprels.json']
+	try : 
+		codex = Path(inspect.getsourcefile(inspect.unwrap(normalizator)))
+		codex = (str(codex),os.stat(codex).st_mtime_ns)
+	except (TypeError,OSError) : #e.g. a built-in method
+		codex = None
+	clavis = (version,lang,getattr(normalizator,'__module__',None),getattr(normalizator,'__qualname__',None),codex,fontium(morphologia,fontes))
+	
+	return caricare(morphologia / 'resources_{}.cache'.format(lang),clavis,lambda : compileresources(morphologia,normalizatores,lang=lang))
+#
+
+#Loads the radical forms of LatInfLexi (see radicalforms) from its file in a directory, compiled only once into a binary bundle as the other resources
+def loadradicalforms(morphologia,latinflexi='LatInfLexi-forms.csv') :
+	
+	from pathlib import Path
+	
+	morphologia = Path(morphologia)
+	clavis = (version,fontium(morphologia,[latinflexi]))
+	
+	return caricare(morphologia / 'radicalforms.cache',clavis,lambda : radicalforms(morphologia / latinflexi))
+#
+
+#Identity of some source files in a directory, by size and time of modification
+def fontium(morphologia,fontes) :
+	
+	import os
+	
+	return tuple([(f,os.stat(morphologia / f).st_size,os.stat(morphologia / f).st_mtime_ns) for f in fontes if (morphologia / f).exists()])
+#
+
+#Bundle stored in a file under a key, compiled and written again if the key has changed (if the file can be written); within the same process it is read only once
+def caricare(fasciculus,clavis,compilare) :
+	
+	import pickle, os
+	
+	if (fasciculus,clavis) in caricate :
+		return caricate[(fasciculus,clavis)]
+	
+	if fasciculus.exists() :
+		with open(fasciculus,'rb') as intro :
+			try :
+				vetus, resources = pickle.load(intro)
+				if vetus == clavis :
+					caricate[(fasciculus,clavis)] = resources
+					return resources
+			except (pickle.UnpicklingError,EOFError,ValueError,AttributeError,TypeError) : #corrupted or obsolete bundle, it will be rewritten
+				pass
+	#
+	
+	resources = compilare()
+	caricate[(fasciculus,clavis)] = resources
+	
+	provisional = fasciculus.with_name(fasciculus.name + '.part')
+	try :
+		with open(provisional,'wb') as exo :
+			pickle.dump((clavis,resources),exo,protocol=pickle.HIGHEST_PROTOCOL)
+		os.replace(provisional,fasciculus)
+	except OSError : #e.g. a read-only or shared directory: the bundle is only kept in memory, and compiled again at the next run
+		if provisional.exists() :
+			try :
+				provisional.unlink()
+			except OSError :
+				pass
+	
+	return resources
+#
+
+#Reads and normalises the morphological resources (see above)
+def compileresources(morphologia,normalizatores,lang='la') :
+	
+	import json
+	
+	with open(morphologia / 'derived','r',encoding='utf8') as intro : 
+		derivata = frozenset(normalizatores([riga.strip() for riga in intro]))
+	#
+	with open(morphologia / 'compound','r',encoding='utf8') as intro : 
+		composita = frozenset(normalizatores([riga.strip() for riga in intro]))
+	#
+	advpos = {}
+	with open(morphologia / 'ADV.tsv','r',encoding='utf8') as intro : 
+		righe = [riga.strip(' \n').split('\t') for riga in intro]
+		for l,(_,p) in zip(normalizatores([r[0] for r in righe]),righe) :
+			advpos[l] = 'PRON' if p == 'REL' else p #See paper for this decision. The ADV treatment is specific for Latin, but can possibly readapted to other languages
+	#
+	with open(morphologia / 'udeprels.json','r',encoding='utf8') as intus : 
+		allbdeprel = frozenset(json.load(intus)['udeprels'])
+	#
+	
+	return Resources(derivata,composita,advpos,allbdeprel)
+#
+
+##The following search for radical forms among the lexicon is ad hoc for Latin and uses a specific resource (LatInfLexi). It might need adjustments according to the evolution of that resources (e.g. inclusion of further parts of speech).
+#A radical form is the longest prefix common to all forms of a paradigm, if it is itself a form of the paradigm. It returns the radical forms by part of speech, then by the (sorted) cells they occupy, as tuples of couples (lemma,form)
+def radicalforms(latinflexi) :
+	
+	from collections import defaultdict
+	
+	flexionarium = defaultdict(lambda : defaultdict(set))
+	flpos = {'n':'NOUN','v':'VERB'}	
+	
+	with open(latinflexi,'r',encoding='utf8') as intro : 
+		next(intro)
+		for riga in intro :
+			f,l,m,of,pf,*_ = map(lambda x : x.strip('"'),riga.strip().split(','))
+			ll,lp = l.split('_')
+			flexionarium[(ll,flpos[lp])][pf.replace(' ','').replace('ˈ','')].add(m) 
+	#
+
+	radicalia = defaultdict(lambda : defaultdict(set))
+	
+	for l,ff in flexionarium.items() : 
+		communis = radix(ff)
+		if communis is not None : 
+			radicalia[l[1]][tuple(sorted(ff[communis]))].add((l[0],communis))
+	#		
+	
+	return {p : {m : tuple(ll) for m,ll in casi.items()} for p,casi in radicalia.items()} #plain dictionaries and tuples can be stored, and keep their order once reloaded
+#
+
+#Radical form of a paradigm (see above), if any, found by descending a prefix trie of its forms as long as there is a single path, down to the first node where the paths diverge or a form ends
+def radix(paradigma) : 
+	
+	trie = {}
+	for forma in paradigma :
+		nodus = trie
+		for c in forma :
+			nodus = nodus.setdefault(c,{})
+		nodus[None] = True #end of a form
+	#
+	
+	communis = []
+	nodus = trie
+	while len(nodus) == 1 and None not in nodus :
+		c, nodus = next(iter(nodus.items()))
+		communis.append(c)
+	
+	return ''.join(communis) if None in nodus else None
+#
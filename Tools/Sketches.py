@@ -0,0 +1,123 @@
+#The following code has been developed by Flavio Massimiliano Cecchini as part of the work presented in "Quid verbumst? Applying a definition of word to Latin in Universal Dependencies", SyntaxFest 2025, Ljubljana. Please give credit to the author if you use any part of it.
+#Contact: flaviomassimiliano.cecchini at kuleuven.be
+
+#Approximate collection within a memory budget, for treebanks whose forms do not fit in exact counters (see Affixes.py, approximate): a Count-Min sketch for the frequencies of forms, and a Misra-Gries summary keeping only the most frequent forms, each with its features
+#Both can be merged (e.g. spans read in parallel, or partial results, see Partials); keys are hashed independently of the process, so that sketches written on different machines can be summed
+
+import math
+from array import array
+
+profondita = 4 #rows of a sketch: an estimate exceeds its error bound with probability e^-4 (less than 2%)
+pondus = 2048 #bytes taken on average by a form kept with its features, as measured on Latin treebanks
+
+#Division of a memory budget (in MiB) between a sketch (a quarter, with counters of 8 bytes) and a summary (the rest): it returns the width of the sketch and the number of forms kept by the summary
+def dividere(budget) :
+	budget = budget * 2**20
+	return max(1,int(budget / 4 / (8 * profondita))), max(1,int(budget * 3 / 4 / pondus))
+#
+
+#Count-Min sketch with conservative update: an estimate is never lower than the real count, and exceeds it by at most e/width times the total count with probability 1 - e^-depth. It is used as a Counter (sketch[key] += 1), but only its estimates can be read
+class CountMinSketch :
+
+	def __init__(self,width,depth=profondita) :
+		self.width = width
+		self.depth = depth
+		self.cells = array('Q',bytes(8 * width * depth)) #64 bits, so that no counter can overflow (and wrap around when merged)
+		self.total = 0
+		self.ultima = (None,())
+
+	#Counters of a key, one per row, by double hashing of a digest of the key; the last key is remembered, as it is read and then raised at once
+	def indices(self,key) :
+		if key != self.ultima[0] :
+			from hashlib import blake2b
+			digestum = blake2b('\x1f'.join(map(str,key)).encode('utf8'),digest_size=16).digest()
+			h1, h2 = int.from_bytes(digestum[:8],'little'), int.from_bytes(digestum[8:],'little') | 1
+			self.ultima = (key,tuple(r * self.width + (h1 + r * h2) % self.width for r in range(self.depth)))
+		return self.ultima[1]
+
+	def __getitem__(self,key) :
+		return min(self.cells[i] for i in self.indices(key))
+
+	#Conservative update: the counters of the key are raised to the new estimate, if lower
+	def __setitem__(self,key,valore) :
+		ii = self.indices(key)
+		self.total += valore - min(self.cells[i] for i in ii)
+		for i in ii :
+			if self.cells[i] < valore :
+				self.cells[i] = valore
+
+	#Adds another sketch of the same size (counter by counter) or the counts of a Counter
+	def update(self,altro) :
+		if not isinstance(altro,CountMinSketch) :
+			for k,v in altro.items() :
+				self[k] = self[k] + v
+			return
+		if (altro.width,altro.depth) != (self.width,self.depth) :
+			raise ValueError('Sketches of different sizes ({}x{} and {}x{}) cannot be merged.'.format(self.depth,self.width,altro.depth,altro.width))
+		if not self.total :
+			self.cells[:] = altro.cells
+		else :
+			try :
+				import numpy
+				celle = numpy.frombuffer(self.cells,dtype=numpy.uint64)
+				celle += numpy.frombuffer(altro.cells,dtype=numpy.uint64)
+			except ImportError :
+				for i,v in enumerate(altro.cells) :
+					if v :
+						self.cells[i] += v
+		self.total += altro.total
+
+	#Highest error of an estimate (with the probability below)
+	@property
+	def error(self) :
+		return math.e / self.width * self.total
+
+	@property
+	def probability(self) :
+		return 1 - math.exp(-self.depth)
+#
+
+#Misra-Gries summary of the most frequent keys, each with its data: a dictionary of at most capacity keys. An occurrence is counted by setdefault, which returns the data of the key, or the default without storing it if there is no room: then all counts decrease by one, and keys reaching zero are dropped
+#A count is lower than the real one by at most the total decrease (error), so that every key occurring more often is kept; this is never more than the occurrences divided by capacity + 1. Data only comes from the occurrences counted since a key was last kept
+class FrequentItems(dict) :
+
+	def __init__(self,capacity) :
+		super().__init__()
+		self.capacity = capacity
+		self.counts = {}
+		self.total = 0
+		self.error = 0
+
+	def setdefault(self,key,default=None) :
+		self.total += 1
+		if key in self.counts :
+			self.counts[key] += 1
+			return self[key]
+		if len(self.counts) < self.capacity :
+			self.counts[key] = 1
+			dict.__setitem__(self,key,default)
+			return default
+		self.error += 1
+		self.counts = {k : c - 1 for k,c in self.counts.items() if c > 1}
+		for k in [k for k in self if k not in self.counts] :
+			del self[k]
+		return default
+
+	#Adds another summary, merging the data of common keys with a function: counts are summed, and if there are more keys than capacity, all counts decrease by the first one left out
+	def merge(self,altro,fold) :
+		for k,c in altro.counts.items() :
+			if k in self.counts :
+				self.counts[k] += c
+				fold(self[k],altro[k])
+			else :
+				self.counts[k] = c
+				dict.__setitem__(self,k,altro[k])
+		self.total += altro.total
+		self.error += altro.error
+		if len(self.counts) > self.capacity :
+			soglia = sorted(self.counts.values(),reverse=True)[self.capacity]
+			self.error += soglia
+			self.counts = {k : c - soglia for k,c in self.counts.items() if c > soglia}
+			for k in [k for k in self if k not in self.counts] :
+				del self[k]
+#